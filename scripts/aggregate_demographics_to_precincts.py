@@ -13,6 +13,8 @@ import geopandas as gpd
 import pandas as pd
 import numpy as np
 
+from precinct_overlay import build_precinct_overlay
+
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -21,6 +23,11 @@ CENSUS_DIR = PROJECT_ROOT / 'data' / 'raw' / 'census'
 PRECINCTS_DIR = PROJECT_ROOT / 'data' / 'raw'
 OUTPUT_DIR = PROJECT_ROOT / 'data' / 'processed'
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+OVERLAY_CACHE_DIR = PROJECT_ROOT / 'data' / 'interim' / 'overlays'
+
+# Block group columns carried through the overlay
+DEMOGRAPHIC_COLS = ['total_pop', 'median_income', 'median_age',
+                    'pct_college', 'pct_white', 'pct_black', 'pct_hispanic']
 
 
 def aggregate_demographics_to_precincts(precinct_shp, census_gpkg, output_csv, year_label='2025'):
@@ -34,18 +41,23 @@ def aggregate_demographics_to_precincts(precinct_shp, census_gpkg, output_csv, y
         year_label: Label for the precinct year
     """
     logger.info(f"Loading {year_label} precincts from {precinct_shp}")
-    precincts = gpd.read_file(precinct_shp)
+    precincts = gpd.read_file(precinct_shp, engine='pyogrio')
     
-    # Standardize CRS
-    if precincts.crs and precincts.crs.to_string() not in ['EPSG:4326', 'EPSG:3734', 'EPSG:3735', 'EPSG:3747']:
-        logger.info(f"Converting precincts from {precincts.crs} to EPSG:3735")
-        precincts = precincts.to_crs('EPSG:3735')
-    elif not precincts.crs:
+    # Standardize CRS (Ohio South, ft) so intersection areas are planar, never degrees
+    if not precincts.crs:
         logger.warning("Precinct shapefile has no CRS, assuming EPSG:3735")
         precincts = precincts.set_crs('EPSG:3735')
+    elif precincts.crs.to_string() != 'EPSG:3735':
+        logger.info(f"Converting precincts from {precincts.crs} to EPSG:3735")
+        precincts = precincts.to_crs('EPSG:3735')
     
     logger.info(f"Loading Census demographics from {census_gpkg}")
-    demographics = gpd.read_file(census_gpkg)
+    demographics = gpd.read_file(census_gpkg, engine='pyogrio',
+                                 columns=['GEOID'] + DEMOGRAPHIC_COLS)
+    
+    # Census estimates carry only a few significant digits; the weighted sums
+    # below still accumulate in float64
+    demographics[DEMOGRAPHIC_COLS] = demographics[DEMOGRAPHIC_COLS].astype('float32')
     
     # Ensure same CRS
     if demographics.crs.to_string() != precincts.crs.to_string():
@@ -54,26 +66,6 @@ def aggregate_demographics_to_precincts(precinct_shp, census_gpkg, output_csv, y
     
     logger.info(f"Loaded {len(precincts)} precincts and {len(demographics)} block groups")
     
-    # Spatial overlay to find intersections
-    logger.info("Computing spatial overlay (this may take a moment)...")
-    overlay = gpd.overlay(precincts, demographics, how='intersection')
-    
-    # Calculate intersection areas
-    overlay['intersection_area'] = overlay.geometry.area
-    
-    # For each precinct-blockgroup intersection, calculate the fraction of the blockgroup's population
-    # that should be assigned to the precinct
-    overlay['pop_weight'] = overlay['intersection_area'] / overlay.groupby('GEOID')['intersection_area'].transform('sum')
-    
-    # Calculate weighted demographics for each precinct
-    demographic_cols = ['total_pop', 'median_income', 'median_age', 
-                        'pct_college', 'pct_white', 'pct_black', 'pct_hispanic']
-    
-    # For median income and median age, we'll use population-weighted average
-    # For percentages, we'll calculate from weighted totals
-    
-    results = []
-    
     # Identify precinct ID column (could be NAME, PRECINCT, etc.)
     precinct_id_col = None
     for col in ['NAME', 'PRECINCT', 'PRECINCTID']:
@@ -87,76 +79,60 @@ def aggregate_demographics_to_precincts(precinct_shp, census_gpkg, output_csv, y
     
     logger.info(f"Using '{precinct_id_col}' as precinct identifier")
     
-    for precinct_id in precincts[precinct_id_col].unique():
-        precinct_data = overlay[overlay[precinct_id_col] == precinct_id].copy()
-        
-        if len(precinct_data) == 0:
-            # No demographic data for this precinct
-            results.append({
-                'PRECINCT': precinct_id,
-                'total_pop': np.nan,
-                'median_income': np.nan,
-                'median_age': np.nan,
-                'pct_college': np.nan,
-                'pct_white': np.nan,
-                'pct_black': np.nan,
-                'pct_hispanic': np.nan,
-            })
-            continue
-        
-        # Calculate weighted population for each intersection
-        precinct_data['weighted_pop'] = precinct_data['total_pop'] * precinct_data['pop_weight']
-        
-        total_pop = precinct_data['weighted_pop'].sum()
-        
-        if total_pop == 0:
-            results.append({
-                'PRECINCT': precinct_id,
-                'total_pop': 0,
-                'median_income': np.nan,
-                'median_age': np.nan,
-                'pct_college': np.nan,
-                'pct_white': np.nan,
-                'pct_black': np.nan,
-                'pct_hispanic': np.nan,
-            })
-            continue
-        
-        # Population-weighted average for median income and age
-        precinct_data['weighted_income'] = precinct_data['median_income'] * precinct_data['weighted_pop']
-        precinct_data['weighted_age'] = precinct_data['median_age'] * precinct_data['weighted_pop']
-        
-        avg_income = precinct_data['weighted_income'].sum() / total_pop
-        avg_age = precinct_data['weighted_age'].sum() / total_pop
-        
-        # For percentages, calculate from raw counts
-        # pct_college is already a percentage in our data, so we need to back-calculate the counts
-        # Actually, looking at the download script, we have the raw counts in B15003_* variables
-        # But we only saved the percentages. Let's just use population-weighted averages for now.
-        
-        precinct_data['weighted_pct_college'] = precinct_data['pct_college'] * precinct_data['weighted_pop']
-        precinct_data['weighted_pct_white'] = precinct_data['pct_white'] * precinct_data['weighted_pop']
-        precinct_data['weighted_pct_black'] = precinct_data['pct_black'] * precinct_data['weighted_pop']
-        precinct_data['weighted_pct_hispanic'] = precinct_data['pct_hispanic'] * precinct_data['weighted_pop']
-        
-        avg_pct_college = precinct_data['weighted_pct_college'].sum() / total_pop
-        avg_pct_white = precinct_data['weighted_pct_white'].sum() / total_pop
-        avg_pct_black = precinct_data['weighted_pct_black'].sum() / total_pop
-        avg_pct_hispanic = precinct_data['weighted_pct_hispanic'].sum() / total_pop
-        
-        results.append({
-            'PRECINCT': precinct_id,
-            'total_pop': total_pop,
-            'median_income': avg_income,
-            'median_age': avg_age,
-            'pct_college': avg_pct_college,
-            'pct_white': avg_pct_white,
-            'pct_black': avg_pct_black,
-            'pct_hispanic': avg_pct_hispanic,
-        })
-    
-    # Convert to DataFrame
-    results_df = pd.DataFrame(results)
+    # Only the ID and geometry are needed from the precinct layer. IDs are
+    # normalized here, once, so the output CSV carries the canonical form.
+    precincts = precincts[[precinct_id_col, 'geometry']].copy()
+    precincts[precinct_id_col] = precincts[precinct_id_col].str.strip().str.upper()
+    
+    # Spatial overlay to find intersections (cached as a slim precinct/GEOID table),
+    # then attach the block group attributes with a plain join
+    logger.info("Computing spatial overlay (this may take a moment)...")
+    overlay = build_precinct_overlay(
+        precincts, demographics, precinct_id_col,
+        cache_path=OVERLAY_CACHE_DIR / f'precincts_{year_label}_{Path(census_gpkg).stem}.parquet',
+        sources=[Path(precinct_shp), Path(census_gpkg)],
+    )
+    overlay = overlay.merge(demographics.drop(columns='geometry'), on='GEOID', how='left')
+    
+    # For each precinct-blockgroup intersection, calculate the fraction of the blockgroup's population
+    # that should be assigned to the precinct
+    overlay['pop_weight'] = overlay['intersection_area'] / overlay.groupby('GEOID')['intersection_area'].transform('sum')
+    
+    # Population-weighted averages for all demographic variables. Percentages are
+    # already rates in the block group data, so they are weighted the same way as
+    # the medians rather than rebuilt from raw counts.
+    weighted_cols = [col for col in DEMOGRAPHIC_COLS if col != 'total_pop']
+    
+    # Position of each intersection's precinct in the output, one row per precinct.
+    # Missing values contribute nothing to the sums, as with a pandas groupby sum.
+    precinct_ids = precincts[precinct_id_col].unique()
+    n_precincts = len(precinct_ids)
+    codes = pd.Index(precinct_ids).get_indexer(overlay[precinct_id_col])
+    weighted_pop = np.nan_to_num(
+        overlay['total_pop'].to_numpy(dtype=float) * overlay['pop_weight'].to_numpy()
+    )
+    values = np.nan_to_num(overlay[weighted_cols].to_numpy(dtype=float))
+    
+    # Per-precinct sums in a single compiled pass per column via bincount
+    total_pop = np.bincount(codes, weights=weighted_pop, minlength=n_precincts)
+    weighted_sums = np.column_stack([
+        np.bincount(codes, weights=values[:, i] * weighted_pop, minlength=n_precincts)
+        for i in range(len(weighted_cols))
+    ])
+    
+    # 0/0 for zero-population precincts gives NaN, matching "no data"
+    with np.errstate(invalid='ignore', divide='ignore'):
+        averages = weighted_sums / total_pop[:, None]
+    
+    # Precincts with no intersecting block groups get NaN for everything
+    has_data = np.bincount(codes, minlength=n_precincts) > 0
+    total_pop[~has_data] = np.nan
+    
+    results_df = pd.DataFrame({
+        'PRECINCT': precinct_ids,
+        'total_pop': total_pop,
+        **{col: averages[:, i] for i, col in enumerate(weighted_cols)},
+    })
     
     # Save to CSV
     results_df.to_csv(output_csv, index=False)
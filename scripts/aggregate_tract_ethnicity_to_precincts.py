@@ -7,12 +7,14 @@ tract-level data (which has coarser geography) to precinct level.
 """
 
 import logging
-import geopandas as gpd
 import pandas as pd
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from precinct_io import CACHE_DIR, read_file_cached
+from precinct_overlay import build_precinct_overlay
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,28 +27,41 @@ PROJECT_ROOT = Path(__file__).parent.parent
 CENSUS_DIR = PROJECT_ROOT / 'data' / 'raw' / 'census'
 PRECINCT_DIR = PROJECT_ROOT / 'data' / 'raw'
 OUTPUT_PATH = PROJECT_ROOT / 'data' / 'processed' / 'ethnicity_by_precinct_2025.csv'
+PRECINCT_SHP = PRECINCT_DIR / 'precincts_2025' / 'VotingPrecinct.shp'
+TRACT_GPKG = CENSUS_DIR / 'franklin_county_tract_ethnicity_2020.gpkg'
+OVERLAY_CACHE_PATH = PROJECT_ROOT / 'data' / 'interim' / 'overlays' / 'precincts_2025_tracts_2020.parquet'
+
+# Tract ethnicity counts allocated to precincts
+ETHNICITY_COLS = [
+    'africa_born', 'east_africa_born', 'west_africa_born',
+    'somalia_born', 'ethiopia_born', 'kenya_born', 'uganda_born',
+    'nigeria_born', 'ghana_born', 'liberia_born',
+    'foreign_born', 'noncitizen'
+]
 
 
 def load_precinct_shapefile():
     """Load 2025 precinct shapefile."""
     logger.info("Loading 2025 precinct shapefile...")
     
-    shp_path = PRECINCT_DIR / 'precincts_2025' / 'VotingPrecinct.shp'
+    shp_path = PRECINCT_SHP
     if not shp_path.exists():
         logger.error(f"Precinct shapefile not found: {shp_path}")
         return None
     
-    precincts = gpd.read_file(shp_path)
+    precincts = read_file_cached(shp_path, CACHE_DIR / 'precincts_2025.parquet',
+                                 columns=['NAME'])
     
     # Ensure CRS
     if precincts.crs is None:
         precincts.set_crs('EPSG:3735', inplace=True)
     
-    # Standardize to common CRS
-    precincts = precincts.to_crs('EPSG:4326')
+    # Standardize to common CRS (Ohio South, ft) so areas are planar
+    if precincts.crs.to_string() != 'EPSG:3735':
+        precincts = precincts.to_crs('EPSG:3735')
     
     # Use NAME column as precinct ID
-    precincts['PRECINCT'] = precincts['NAME'].str.strip().str.upper()
+    precincts['PRECINCT'] = precincts['NAME'].str.strip().str.upper().astype('category')
     
     logger.info(f"  Loaded {len(precincts)} precincts")
     return precincts
@@ -56,72 +71,56 @@ def load_tract_ethnicity():
     """Load tract-level ethnicity data."""
     logger.info("Loading tract ethnicity data...")
     
-    gpkg_path = CENSUS_DIR / 'franklin_county_tract_ethnicity_2020.gpkg'
+    gpkg_path = TRACT_GPKG
     if not gpkg_path.exists():
         logger.error(f"Tract ethnicity file not found: {gpkg_path}")
         return None
     
-    tracts = gpd.read_file(gpkg_path)
+    # Only the counts used in the allocation are needed from the GeoPackage
+    tracts = read_file_cached(gpkg_path, CACHE_DIR / 'tract_ethnicity_2020.parquet',
+                              columns=['GEOID', 'pob_universe'] + ETHNICITY_COLS)
     
-    # Standardize to common CRS
-    tracts = tracts.to_crs('EPSG:4326')
+    # Standardize to common CRS (Ohio South, ft) so area fractions are planar
+    tracts = tracts.to_crs('EPSG:3735')
     
     logger.info(f"  Loaded {len(tracts)} tracts")
     logger.info(f"  Total Africa-born: {tracts['africa_born'].sum():,.0f}")
     return tracts
 
 
-def spatially_aggregate_to_precincts(precincts, tracts):
+def spatially_aggregate_to_precincts(precincts, tracts, cache_path=None, sources=()):
     """
     Aggregate tract data to precincts using spatial intersection.
     
     Method: For each precinct, find all intersecting tracts and allocate
-    their populations proportional to the intersection area.
+    their populations proportional to the intersection area. The
+    precinct/tract overlay is cached at cache_path when given.
     """
     logger.info("Performing spatial intersection...")
     logger.info("  This may take a few minutes...")
     
-    # Perform intersection
-    intersection = gpd.overlay(precincts[['PRECINCT', 'geometry']], 
-                               tracts, 
-                               how='intersection',
-                               keep_geom_type=False)
-    
-    # Calculate area of each intersection piece
-    intersection['int_area'] = intersection.geometry.area
-    
-    # Calculate what fraction of each tract falls in each precinct
-    tract_areas = tracts.set_index('GEOID').geometry.area.to_dict()
-    intersection['tract_area'] = intersection['GEOID'].map(tract_areas)
-    intersection['area_fraction'] = intersection['int_area'] / intersection['tract_area']
+    # Precinct/tract pieces with the fraction of each tract falling in each
+    # precinct, then the tract counts attached with a plain join
+    intersection = build_precinct_overlay(precincts, tracts, 'PRECINCT',
+                                          cache_path=cache_path, sources=sources)
+    intersection = intersection.merge(tracts.drop(columns='geometry'), on='GEOID', how='left')
     
     logger.info(f"  Created {len(intersection)} intersection polygons")
     
-    # Allocate populations proportionally
-    # For each ethnicity variable, multiply by the area fraction
-    ethnicity_cols = [
-        'africa_born', 'east_africa_born', 'west_africa_born',
-        'somalia_born', 'ethiopia_born', 'kenya_born', 'uganda_born',
-        'nigeria_born', 'ghana_born', 'liberia_born',
-        'foreign_born', 'noncitizen'
-    ]
-    
-    for col in ethnicity_cols:
-        intersection[f'{col}_allocated'] = intersection[col] * intersection['area_fraction']
+    # Allocate populations proportionally: multiply every count column (plus the
+    # place-of-birth universe) by the area fraction in one broadcast
+    count_cols = ETHNICITY_COLS + ['pob_universe']
+    allocated = pd.DataFrame(
+        intersection[count_cols].to_numpy(dtype=float)
+        * intersection['area_fraction'].to_numpy()[:, None],
+        columns=count_cols,
+        index=intersection.index,
+    )
     
     # Group by precinct and sum allocated populations
     logger.info("Aggregating to precincts...")
     
-    allocated_cols = [f'{col}_allocated' for col in ethnicity_cols]
-    precinct_eth = intersection.groupby('PRECINCT')[allocated_cols].sum()
-    
-    # Rename columns (remove _allocated suffix)
-    precinct_eth.columns = [col.replace('_allocated', '') for col in precinct_eth.columns]
-    
-    # Also get the universe (total population in place-of-birth question)
-    intersection['pob_universe_allocated'] = intersection['pob_universe'] * intersection['area_fraction']
-    precinct_pob = intersection.groupby('PRECINCT')['pob_universe_allocated'].sum()
-    precinct_eth['pob_universe'] = precinct_pob
+    precinct_eth = allocated.groupby(intersection['PRECINCT'], observed=True).sum()
     
     # Calculate percentages
     precinct_eth['pct_africa_born'] = (precinct_eth['africa_born'] / precinct_eth['pob_universe'] * 100)
@@ -157,7 +156,11 @@ def main():
         return 1
     
     # Aggregate to precincts
-    precinct_ethnicity = spatially_aggregate_to_precincts(precincts, tracts)
+    precinct_ethnicity = spatially_aggregate_to_precincts(
+        precincts, tracts,
+        cache_path=OVERLAY_CACHE_PATH,
+        sources=[PRECINCT_SHP, TRACT_GPKG],
+    )
     
     # Save to CSV
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -7,14 +7,20 @@ distinct voting blocs.
 """
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import geopandas as gpd
 import pandas as pd
+from pandas.api.types import union_categoricals
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Figures are only written to disk, including from worker processes
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from precinct_io import normalize_precinct_ids
+
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -25,16 +31,31 @@ PROCESSED_DIR = DATA_DIR / 'processed'
 OUTPUT_DIR = PROCESSED_DIR / 'demographic_analysis'
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+DEMO_COLS = ['median_income', 'median_age', 'pct_college',
+             'pct_white', 'pct_black', 'pct_hispanic', 'total_pop']
+
+# Races to analyze: (label, heading, results CSV in RAW_DIR)
+RACES = [
+    ('2024 Presidential', '2024 Presidential Election', 'results_2024.csv'),
+    ('2023 Issue 1', '2023 Issue 1 (Abortion Rights)', 'results_2023_issue1.csv'),
+]
+
 
 def load_voting_and_demographics(vote_csv, demo_csv):
     """Load and merge voting results with demographics."""
     logger.info(f"Loading voting data from {vote_csv}")
     votes = pd.read_csv(vote_csv)
-    votes['PRECINCT'] = votes['PRECINCT'].str.strip().str.upper()
+    votes['PRECINCT'] = normalize_precinct_ids(votes['PRECINCT'])
     
     logger.info(f"Loading demographics from {demo_csv}")
-    demographics = pd.read_csv(demo_csv)
-    demographics['PRECINCT'] = demographics['PRECINCT'].str.strip().str.upper()
+    # Demographics carry only a few significant digits, so float32 is plenty
+    demographics = pd.read_csv(demo_csv, dtype={col: 'float32' for col in DEMO_COLS})
+    demographics['PRECINCT'] = normalize_precinct_ids(demographics['PRECINCT'])
+    
+    # Share one category set so the merge joins on integer codes
+    categories = union_categoricals([votes['PRECINCT'], demographics['PRECINCT']]).categories
+    votes['PRECINCT'] = votes['PRECINCT'].cat.set_categories(categories)
+    demographics['PRECINCT'] = demographics['PRECINCT'].cat.set_categories(categories)
     
     # Calculate Democratic share
     votes['D_share'] = votes['D_votes'] / (votes['D_votes'] + votes['R_votes'])
@@ -58,19 +79,22 @@ def clean_demographics(df):
     return df
 
 
-def compute_correlations(df, race_label):
-    """Compute correlations between demographics and D_share."""
-    demo_cols = ['median_income', 'median_age', 'pct_college', 
-                 'pct_white', 'pct_black', 'pct_hispanic', 'total_pop']
-    
-    # Remove rows with missing values for correlation
-    df_clean = df[['D_share'] + demo_cols].dropna()
-    
+def prepare_analysis_data(df):
+    """
+    Drop precincts with missing demographics and compute the correlation matrix.
+    
+    Returns the cleaned DataFrame (PRECINCT, D_share and demographic columns)
+    and its correlation matrix, shared by all analyses of a race.
+    """
+    df_clean = df[['PRECINCT', 'D_share'] + DEMO_COLS].dropna()
+    corr_matrix = df_clean.drop(columns='PRECINCT').corr()
+    return df_clean, corr_matrix
+
+
+def compute_correlations(df_clean, corr_matrix, race_label):
+    """Report correlations between demographics and D_share."""
     logger.info(f"Computing correlations for {race_label} ({len(df_clean)} precincts)")
     
-    # Compute correlation matrix
-    corr_matrix = df_clean.corr()
-    
     # Extract correlations with D_share
     d_share_corr = corr_matrix['D_share'].drop('D_share').sort_values(ascending=False)
     
@@ -86,14 +110,14 @@ def compute_correlations(df, race_label):
     plt.tight_layout()
     
     output_path = OUTPUT_DIR / f'correlation_heatmap_{race_label.replace(" ", "_").lower()}.png'
-    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    fig.savefig(output_path, dpi=100, bbox_inches='tight')
     logger.info(f"✓ Saved heatmap to {output_path}")
     plt.close(fig)
     
     return d_share_corr
 
 
-def create_scatter_plots(df, race_label):
+def create_scatter_plots(df_clean, corr_matrix, race_label):
     """Create scatter plots of D_share vs key demographic variables."""
     demo_vars = [
         ('median_income', 'Median Household Income', '$'),
@@ -102,28 +126,30 @@ def create_scatter_plots(df, race_label):
         ('pct_black', '% Black', '%'),
     ]
     
+    # Least-squares lines follow from the shared correlations:
+    # slope = r * std(y) / std(x), intercept = mean(y) - slope * mean(x)
+    means = df_clean[[var for var, _, _ in demo_vars] + ['D_share']].mean()
+    stds = df_clean[[var for var, _, _ in demo_vars] + ['D_share']].std()
+    
     fig, axes = plt.subplots(2, 2, figsize=(14, 12))
     axes = axes.flatten()
     
     for idx, (var, label, unit) in enumerate(demo_vars):
         ax = axes[idx]
         
-        # Remove missing data
-        plot_data = df[[var, 'D_share']].dropna()
-        
         # Scatter plot
-        ax.scatter(plot_data[var], plot_data['D_share'] * 100, 
-                   alpha=0.5, s=30, color='steelblue')
+        # Only the point cloud is rasterized; axes and text stay vector
+        ax.scatter(df_clean[var], df_clean['D_share'] * 100, 
+                   alpha=0.5, s=30, color='steelblue', rasterized=True)
         
         # Add regression line
-        if len(plot_data) > 5:
-            z = np.polyfit(plot_data[var], plot_data['D_share'] * 100, 1)
-            p = np.poly1d(z)
-            x_line = np.linspace(plot_data[var].min(), plot_data[var].max(), 100)
-            ax.plot(x_line, p(x_line), 'r--', linewidth=2, alpha=0.8)
+        if len(df_clean) > 5:
+            corr = corr_matrix.loc[var, 'D_share']
+            slope = corr * stds['D_share'] * 100 / stds[var]
+            intercept = means['D_share'] * 100 - slope * means[var]
+            x_line = np.linspace(df_clean[var].min(), df_clean[var].max(), 100)
+            ax.plot(x_line, slope * x_line + intercept, 'r--', linewidth=2, alpha=0.8)
             
-            # Calculate R²
-            corr = plot_data[var].corr(plot_data['D_share'])
             r_squared = corr ** 2
             ax.text(0.05, 0.95, f'R² = {r_squared:.3f}\nr = {corr:+.3f}',
                     transform=ax.transAxes, fontsize=10,
@@ -141,33 +167,32 @@ def create_scatter_plots(df, race_label):
     plt.tight_layout()
     
     output_path = OUTPUT_DIR / f'scatter_plots_{race_label.replace(" ", "_").lower()}.png'
-    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    fig.savefig(output_path, dpi=100, bbox_inches='tight')
     logger.info(f"✓ Saved scatter plots to {output_path}")
     plt.close(fig)
 
 
-def identify_demographic_blocs(df, race_label):
+def identify_demographic_blocs(df_clean, race_label):
     """Identify distinct demographic voting blocs."""
     logger.info(f"\nIdentifying demographic voting blocs for {race_label}...")
     
-    # Clean data
-    analysis_cols = ['median_income', 'pct_college', 'pct_white', 'pct_black', 'D_share']
-    df_clean = df[analysis_cols + ['PRECINCT']].dropna()
+    df_clean = df_clean[['PRECINCT', 'median_income', 'pct_college',
+                         'pct_white', 'pct_black', 'D_share']].copy()
     
     # Define demographic categories
     income_median = df_clean['median_income'].median()
     college_median = df_clean['pct_college'].median()
     
-    df_clean['income_category'] = df_clean['median_income'].apply(
-        lambda x: 'High Income' if x > income_median else 'Low Income'
+    df_clean['income_category'] = np.where(
+        df_clean['median_income'] > income_median, 'High Income', 'Low Income'
     )
-    df_clean['education_category'] = df_clean['pct_college'].apply(
-        lambda x: 'High Education' if x > college_median else 'Low Education'
+    df_clean['education_category'] = np.where(
+        df_clean['pct_college'] > college_median, 'High Education', 'Low Education'
     )
-    df_clean['racial_majority'] = df_clean.apply(
-        lambda row: 'Majority White' if row['pct_white'] > 60 
-                    else ('Majority Black' if row['pct_black'] > 40 else 'Diverse'),
-        axis=1
+    df_clean['racial_majority'] = np.select(
+        [df_clean['pct_white'] > 60, df_clean['pct_black'] > 40],
+        ['Majority White', 'Majority Black'],
+        default='Diverse'
     )
     
     # Group by demographic categories
@@ -199,10 +224,9 @@ def identify_demographic_blocs(df, race_label):
     # Sort by D_share for clarity
     grouped_reset = grouped_reset.sort_values('D_share_pct', ascending=True)
     
+    # One colormap call returns the (N, 4) RGBA array for every bar
     bars = ax.barh(range(len(grouped_reset)), grouped_reset['D_share_pct'], 
-                    color=grouped_reset['D_share_pct'].apply(
-                        lambda x: plt.cm.RdBu(x / 100)
-                    ))
+                    color=plt.cm.RdBu(grouped_reset['D_share_pct'].to_numpy() / 100))
     
     ax.set_yticks(range(len(grouped_reset)))
     ax.set_yticklabels(grouped_reset['group_label'], fontsize=9)
@@ -214,18 +238,64 @@ def identify_demographic_blocs(df, race_label):
     ax.set_xlim(0, 100)
     
     # Add vote count labels
-    for idx, row in enumerate(grouped_reset.itertuples()):
-        ax.text(row.D_share_pct + 2, idx, f"n={row.num_precincts:.0f}", 
-                va='center', fontsize=8, color='black')
+    ax.bar_label(bars, labels=[f"n={n:.0f}" for n in grouped_reset['num_precincts']],
+                 padding=3, fontsize=8, color='black')
     
     plt.tight_layout()
     
     output_path = OUTPUT_DIR / f'demographic_blocs_{race_label.replace(" ", "_").lower()}.png'
-    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    fig.savefig(output_path, dpi=100, bbox_inches='tight')
     logger.info(f"✓ Saved demographic blocs chart to {output_path}")
     plt.close(fig)
 
 
+def analyze_race(race_label, heading, vote_csv, demo_csv):
+    """Run the correlation, scatter plot, and voting bloc analyses for one race."""
+    logger.info("\n" + "=" * 60)
+    logger.info(f"ANALYZING: {heading}")
+    logger.info("=" * 60)
+    
+    df = load_voting_and_demographics(vote_csv, demo_csv)
+    df = clean_demographics(df)
+    
+    df_clean, corr_matrix = prepare_analysis_data(df)
+    
+    compute_correlations(df_clean, corr_matrix, race_label)
+    create_scatter_plots(df_clean, corr_matrix, race_label)
+    identify_demographic_blocs(df_clean, race_label)
+
+
+class _RecordBuffer(logging.Handler):
+    """Logging handler that keeps records in memory instead of emitting them."""
+    
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    
+    def emit(self, record):
+        # Format now so the record pickles back to the parent cleanly
+        record.msg = record.getMessage()
+        record.args = None
+        self.records.append(record)
+
+
+def analyze_race_buffered(race_label, heading, vote_csv, demo_csv):
+    """
+    Run analyze_race in a worker process and return its log records.
+    
+    Nothing is written while the race runs; the parent replays the records
+    once the race is done, so each race's report stays contiguous.
+    """
+    root = logging.getLogger()
+    buffer = _RecordBuffer()
+    handlers, root.handlers = root.handlers, [buffer]
+    try:
+        analyze_race(race_label, heading, vote_csv, demo_csv)
+    finally:
+        root.handlers = handlers
+    return buffer.records
+
+
 def main():
     """Analyze demographic correlations for key races."""
     logger.info("=" * 60)
@@ -239,33 +309,19 @@ def main():
         logger.error("Run: python scripts/aggregate_demographics_to_precincts.py")
         return 1
     
-    # Analyze 2024 Presidential race
-    vote_2024 = RAW_DIR / 'results_2024.csv'
-    if vote_2024.exists():
-        logger.info("\n" + "=" * 60)
-        logger.info("ANALYZING: 2024 Presidential Election")
-        logger.info("=" * 60)
-        
-        df = load_voting_and_demographics(vote_2024, demo_csv)
-        df = clean_demographics(df)
-        
-        compute_correlations(df, "2024 Presidential")
-        create_scatter_plots(df, "2024 Presidential")
-        identify_demographic_blocs(df, "2024 Presidential")
-    
-    # Analyze 2023 Issue 1 (Abortion Rights)
-    vote_2023 = RAW_DIR / 'results_2023_issue1.csv'
-    if vote_2023.exists():
-        logger.info("\n" + "=" * 60)
-        logger.info("ANALYZING: 2023 Issue 1 (Abortion Rights)")
-        logger.info("=" * 60)
-        
-        df = load_voting_and_demographics(vote_2023, demo_csv)
-        df = clean_demographics(df)
-        
-        compute_correlations(df, "2023 Issue 1")
-        create_scatter_plots(df, "2023 Issue 1")
-        identify_demographic_blocs(df, "2023 Issue 1")
+    races = [
+        (race_label, heading, RAW_DIR / filename, demo_csv)
+        for race_label, heading, filename in RACES
+        if (RAW_DIR / filename).exists()
+    ]
+    
+    # Races are independent, so each one is analyzed in its own process;
+    # their logs are replayed here in race order
+    if races:
+        with ProcessPoolExecutor(max_workers=len(races)) as executor:
+            for records in executor.map(analyze_race_buffered, *zip(*races)):
+                for record in records:
+                    logging.getLogger(record.name).handle(record)
     
     logger.info("\n" + "=" * 60)
     logger.info("✓ DEMOGRAPHIC ANALYSIS COMPLETE")
@@ -10,10 +10,15 @@ import logging
 from pathlib import Path
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyogrio
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from precinct_io import CACHE_DIR, read_file_cached
+from precinct_overlay import compute_precinct_overlay
+
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -23,11 +28,14 @@ DISTRICTS_SHP = PROJECT_ROOT / 'data' / 'raw' / 'otherBoundaries' / 'CMHcc'
 OUTPUT_DIR = PROJECT_ROOT / 'data' / 'processed' / 'district_analysis'
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Block group columns averaged (population-weighted) per district
+DEMOGRAPHIC_COLS = ['median_income', 'median_age', 'pct_college', 'pct_white', 'pct_black', 'pct_hispanic']
+
 
 def aggregate_demographics_by_district():
     """Aggregate Census block group demographics by City Council district."""
     logger.info("Loading Columbus City Council districts...")
-    districts = gpd.read_file(DISTRICTS_SHP)
+    districts = gpd.read_file(DISTRICTS_SHP, engine='pyogrio')
     logger.info(f"Loaded {len(districts)} districts")
     
     # Load Census demographics (block groups with demographic data)
@@ -35,8 +43,19 @@ def aggregate_demographics_by_district():
     if not census_gpkg.exists():
         raise FileNotFoundError(f"Census data not found: {census_gpkg}. Run: python scripts/download_census_data.py")
     
+    # Only block groups within the districts' bounding box can intersect a
+    # district, so let OGR's spatial index skip the rest of the county
+    census_crs = pyogrio.read_info(census_gpkg)['crs']
+    district_bounds = tuple(districts.to_crs(census_crs).total_bounds)
+    district_files = sorted(DISTRICTS_SHP.iterdir()) if DISTRICTS_SHP.is_dir() else [DISTRICTS_SHP]
+    
     logger.info("Loading Census block groups with demographics...")
-    demographics = gpd.read_file(census_gpkg)
+    demographics = read_file_cached(
+        census_gpkg,
+        CACHE_DIR / 'franklin_county_demographics_2020_council_districts.parquet',
+        sources=district_files,
+        bbox=district_bounds,
+    )
     logger.info(f"Loaded {len(demographics)} block groups")
     
     # Ensure same CRS
@@ -45,55 +64,51 @@ def aggregate_demographics_by_district():
         districts = districts.to_crs(demographics.crs)
     
     # Spatial overlay to find which block groups intersect with each district
+    # (bulk STRtree query + vectorized intersection areas), then attach the
+    # block group attributes
     logger.info("Computing spatial overlay...")
-    overlay = gpd.overlay(districts, demographics, how='intersection')
-    
-    # Calculate intersection areas
-    overlay['intersection_area'] = overlay.geometry.area
-    
-    # For each district-blockgroup intersection, calculate population weight
-    overlay['pop_weight'] = overlay['intersection_area'] / overlay.groupby('GEOID')['intersection_area'].transform('sum')
-    
-    # Calculate weighted demographics for each district
-    results = []
-    
-    for district_id in sorted(districts['DISTRICT'].unique()):
-        district_data = overlay[overlay['DISTRICT'] == district_id].copy()
-        
-        if len(district_data) == 0:
-            logger.warning(f"No demographic data for District {district_id}")
-            continue
-        
-        # Calculate weighted population
-        district_data['weighted_pop'] = district_data['total_pop'] * district_data['pop_weight']
-        total_pop = district_data['weighted_pop'].sum()
-        
-        if total_pop == 0:
-            logger.warning(f"Zero population for District {district_id}")
-            continue
-        
-        # Population-weighted averages
-        district_data['weighted_income'] = district_data['median_income'] * district_data['weighted_pop']
-        district_data['weighted_age'] = district_data['median_age'] * district_data['weighted_pop']
-        district_data['weighted_pct_college'] = district_data['pct_college'] * district_data['weighted_pop']
-        district_data['weighted_pct_white'] = district_data['pct_white'] * district_data['weighted_pop']
-        district_data['weighted_pct_black'] = district_data['pct_black'] * district_data['weighted_pop']
-        district_data['weighted_pct_hispanic'] = district_data['pct_hispanic'] * district_data['weighted_pop']
-        
-        results.append({
-            'District': f"District {district_id}",
-            'district_num': district_id,
-            'total_pop': int(total_pop),
-            'median_income': district_data['weighted_income'].sum() / total_pop,
-            'median_age': district_data['weighted_age'].sum() / total_pop,
-            'pct_college': district_data['weighted_pct_college'].sum() / total_pop,
-            'pct_white': district_data['weighted_pct_white'].sum() / total_pop,
-            'pct_black': district_data['weighted_pct_black'].sum() / total_pop,
-            'pct_hispanic': district_data['weighted_pct_hispanic'].sum() / total_pop,
-        })
-    
-    # Convert to DataFrame
-    results_df = pd.DataFrame(results)
+    overlay = compute_precinct_overlay(districts, demographics, 'DISTRICT')
+    overlay = overlay.merge(demographics.drop(columns='geometry'), on='GEOID', how='left')
+    
+    # For each district-blockgroup intersection, calculate population weight.
+    # Block group positions are a dense integer key, so the per-GEOID area
+    # totals are a single bincount rather than a groupby transform.
+    geoid_codes = pd.Index(demographics['GEOID']).get_indexer(overlay['GEOID'])
+    areas = overlay['intersection_area'].to_numpy()
+    area_sums = np.bincount(geoid_codes, weights=areas, minlength=len(demographics))
+    overlay['pop_weight'] = areas / area_sums[geoid_codes]
+    
+    # Position of each intersection's district in the sorted district list.
+    # Missing values contribute nothing to the sums, as with a pandas groupby sum.
+    district_ids = np.sort(districts['DISTRICT'].unique())
+    n_districts = len(district_ids)
+    codes = pd.Index(district_ids).get_indexer(overlay['DISTRICT'])
+    weighted_pop = np.nan_to_num(
+        overlay['total_pop'].to_numpy(dtype=float) * overlay['pop_weight'].to_numpy()
+    )
+    values = np.nan_to_num(overlay[DEMOGRAPHIC_COLS].to_numpy(dtype=float))
+    
+    # Per-district sums in a single compiled pass per column via bincount
+    total_pop = np.bincount(codes, weights=weighted_pop, minlength=n_districts)
+    weighted_sums = np.column_stack([
+        np.bincount(codes, weights=values[:, i] * weighted_pop, minlength=n_districts)
+        for i in range(len(DEMOGRAPHIC_COLS))
+    ])
+    has_data = np.bincount(codes, minlength=n_districts) > 0
+    
+    for district_id in district_ids[~has_data]:
+        logger.warning(f"No demographic data for District {district_id}")
+    for district_id in district_ids[has_data & (total_pop == 0)]:
+        logger.warning(f"Zero population for District {district_id}")
+    keep = has_data & (total_pop != 0)
+    
+    # Population-weighted averages
+    results_df = pd.DataFrame({
+        'District': [f"District {district_id}" for district_id in district_ids[keep]],
+        'district_num': district_ids[keep],
+        'total_pop': total_pop[keep].astype(int),
+        **{col: weighted_sums[keep, i] / total_pop[keep] for i, col in enumerate(DEMOGRAPHIC_COLS)},
+    })
     results_df = results_df.sort_values('district_num')
     
     # Save to CSV
@@ -123,6 +138,11 @@ def create_visualizations(results_df):
     """Create demographic comparison charts for districts."""
     logger.info("\nCreating visualizations...")
     
+    # Column summaries and normalized values shared by several charts
+    stats = results_df[['median_income', 'median_age', 'pct_college']].agg(['max', 'mean'])
+    income_norm = results_df['median_income'] / stats.loc['max', 'median_income']
+    age_norm = results_df['median_age'] / stats.loc['max', 'median_age']
+    
     # Set style
     sns.set_style("whitegrid")
     
@@ -132,11 +152,7 @@ def create_visualizations(results_df):
     ax.set_ylabel('Population', fontsize=12)
     ax.set_title('Population by Columbus City Council District', fontsize=14, fontweight='bold')
     ax.tick_params(axis='x', rotation=45)
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{int(height):,}',
-                ha='center', va='bottom', fontsize=9)
+    ax.bar_label(bars, labels=[f'{int(v):,}' for v in results_df['total_pop']], fontsize=9)
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / 'district_population.png', dpi=150)
     logger.info(f"✓ Saved {OUTPUT_DIR / 'district_population.png'}")
@@ -145,17 +161,13 @@ def create_visualizations(results_df):
     # 2. Income comparison
     fig, ax = plt.subplots(figsize=(10, 6))
     bars = ax.bar(results_df['District'], results_df['median_income'], 
-                   color=plt.cm.RdYlGn(results_df['median_income'] / results_df['median_income'].max()))
+                   color=plt.cm.RdYlGn(income_norm))
     ax.set_ylabel('Median Household Income ($)', fontsize=12)
     ax.set_title('Median Income by Columbus City Council District', fontsize=14, fontweight='bold')
     ax.tick_params(axis='x', rotation=45)
-    ax.axhline(results_df['median_income'].mean(), color='red', linestyle='--', linewidth=2, alpha=0.7, label='City Average')
+    ax.axhline(stats.loc['mean', 'median_income'], color='red', linestyle='--', linewidth=2, alpha=0.7, label='City Average')
     ax.legend()
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'${int(height):,}',
-                ha='center', va='bottom', fontsize=9)
+    ax.bar_label(bars, labels=[f'${int(v):,}' for v in results_df['median_income']], fontsize=9)
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / 'district_income.png', dpi=150)
     logger.info(f"✓ Saved {OUTPUT_DIR / 'district_income.png'}")
@@ -168,13 +180,9 @@ def create_visualizations(results_df):
     ax.set_ylabel('% with College Degree', fontsize=12)
     ax.set_title('Educational Attainment by Columbus City Council District', fontsize=14, fontweight='bold')
     ax.tick_params(axis='x', rotation=45)
-    ax.axhline(results_df['pct_college'].mean(), color='red', linestyle='--', linewidth=2, alpha=0.7, label='City Average')
+    ax.axhline(stats.loc['mean', 'pct_college'], color='red', linestyle='--', linewidth=2, alpha=0.7, label='City Average')
     ax.legend()
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.1f}%',
-                ha='center', va='bottom', fontsize=9)
+    ax.bar_label(bars, fmt='%.1f%%', fontsize=9)
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / 'district_education.png', dpi=150)
     logger.info(f"✓ Saved {OUTPUT_DIR / 'district_education.png'}")
@@ -202,13 +210,16 @@ def create_visualizations(results_df):
     # 5. Comprehensive comparison heatmap
     fig, ax = plt.subplots(figsize=(10, 8))
     
-    # Normalize data for heatmap (0-100 scale)
-    heatmap_data = results_df[['District', 'median_income', 'median_age', 'pct_college', 'pct_white', 'pct_black', 'pct_hispanic']].copy()
-    heatmap_data['median_income_norm'] = (heatmap_data['median_income'] / heatmap_data['median_income'].max() * 100).round(1)
-    heatmap_data['median_age_norm'] = (heatmap_data['median_age'] / heatmap_data['median_age'].max() * 100).round(1)
-    
-    plot_data = heatmap_data[['District', 'median_income_norm', 'median_age_norm', 'pct_college', 'pct_white', 'pct_black', 'pct_hispanic']].set_index('District')
-    plot_data.columns = ['Income\n(normalized)', 'Age\n(normalized)', '% College', '% White\n(NH)', '% Black', '% Hispanic']
+    # Normalize data for heatmap (0-100 scale), built directly from the result
+    # columns rather than a copied frame
+    plot_data = pd.DataFrame({
+        'Income\n(normalized)': (income_norm * 100).round(1).to_numpy(),
+        'Age\n(normalized)': (age_norm * 100).round(1).to_numpy(),
+        '% College': results_df['pct_college'].to_numpy(),
+        '% White\n(NH)': results_df['pct_white'].to_numpy(),
+        '% Black': results_df['pct_black'].to_numpy(),
+        '% Hispanic': results_df['pct_hispanic'].to_numpy(),
+    }, index=pd.Index(results_df['District'], name='District'))
     
     sns.heatmap(plot_data.T, annot=True, fmt='.1f', cmap='YlOrRd', cbar_kws={'label': 'Value'}, ax=ax)
     ax.set_title('Demographic Comparison: Columbus City Council Districts', fontsize=14, fontweight='bold')
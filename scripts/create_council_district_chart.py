@@ -3,12 +3,17 @@
 Create a bar chart showing demographics and Vogel support by Council District.
 """
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 import geopandas as gpd
+import shapely
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 
+from precinct_io import normalize_precinct_ids
+
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (14, 8)
@@ -30,13 +35,15 @@ def main():
     
     districts = pd.read_csv(demo_path)
     
-    # Load precinct demographics
-    precinct_demo = pd.read_csv(PROJECT_ROOT / 'data' / 'processed' / 'demographics_by_precinct_2025.csv')
-    precinct_demo['PRECINCT'] = precinct_demo['PRECINCT'].str.strip().str.upper()
+    # Load precinct demographics (only the precinct key is used below)
+    precinct_demo = pd.read_csv(PROJECT_ROOT / 'data' / 'processed' / 'demographics_by_precinct_2025.csv',
+                                usecols=['PRECINCT'])
+    precinct_demo['PRECINCT'] = normalize_precinct_ids(precinct_demo['PRECINCT'])
     
     # Load CD7 voting data
-    cd7 = pd.read_csv(PROJECT_ROOT / 'data' / 'raw' / 'results_2025_columbus_cd7.csv')
-    cd7['PRECINCT'] = cd7['PRECINCT'].str.strip().str.upper()
+    cd7 = pd.read_csv(PROJECT_ROOT / 'data' / 'raw' / 'results_2025_columbus_cd7.csv',
+                      usecols=['PRECINCT', 'D_votes', 'R_votes'])
+    cd7['PRECINCT'] = normalize_precinct_ids(cd7['PRECINCT'])
     cd7['vogel_share'] = cd7['D_votes'] / (cd7['D_votes'] + cd7['R_votes'])
     
     # Load Council District shapefile
@@ -47,35 +54,53 @@ def main():
     if precincts.crs is None:
         precincts.set_crs('EPSG:3735', inplace=True)
     precincts = precincts.to_crs(cc_districts.crs)
-    precincts['PRECINCT'] = precincts['NAME'].str.strip().str.upper()
+    precincts['PRECINCT'] = normalize_precinct_ids(precincts['NAME'])
+    
+    # Share one set of categories across the precinct keys so the merges
+    # below join on integer codes
+    keyed = [precinct_demo, cd7, precincts]
+    categories = union_categoricals([df['PRECINCT'] for df in keyed]).categories
+    for df in keyed:
+        df['PRECINCT'] = df['PRECINCT'].cat.set_categories(categories)
     
     # Merge precinct voting with demographics
     precinct_data = precinct_demo.merge(cd7[['PRECINCT', 'vogel_share', 'D_votes', 'R_votes']], 
                                         on='PRECINCT', how='inner')
     
-    # Spatial join precincts to council districts
+    # Spatial join precincts to council districts: one bulk STRtree query
+    # returns every intersecting (precinct, district) pair as index arrays.
+    # The nine large district polygons are prepared and used as the query
+    # side, so GEOS builds each one's edge index once and reuses it for
+    # every candidate precinct.
     print("Performing spatial join...")
-    precincts_with_cd = gpd.sjoin(precincts[['PRECINCT', 'geometry']], 
-                                   cc_districts[['DISTRICT', 'geometry']], 
-                                   how='inner', predicate='intersects')
+    district_geoms = cc_districts.geometry.to_numpy()
+    shapely.prepare(district_geoms)
+    tree = shapely.STRtree(precincts.geometry.to_numpy())
+    district_idx, precinct_idx = tree.query(district_geoms, predicate='intersects')
+    precincts_with_cd = pd.DataFrame({
+        'PRECINCT': precincts['PRECINCT'].array.take(precinct_idx),
+        'DISTRICT': cc_districts['DISTRICT'].to_numpy()[district_idx],
+    })
     
     # Merge with precinct data
     precinct_data = precinct_data.merge(precincts_with_cd[['PRECINCT', 'DISTRICT']], 
                                        on='PRECINCT', how='left')
     
-    # Calculate Vogel support by district (weighted by votes)
-    district_vogel = []
-    for district_num in range(1, 10):
-        district_precincts = precinct_data[precinct_data['DISTRICT'] == district_num]
-        if len(district_precincts) > 0:
-            total_vogel = district_precincts['D_votes'].sum()
-            total_ross = district_precincts['R_votes'].sum()
-            vogel_pct = total_vogel / (total_vogel + total_ross) * 100 if (total_vogel + total_ross) > 0 else 0
-            district_vogel.append({'district_num': district_num, 'vogel_support': vogel_pct})
-        else:
-            district_vogel.append({'district_num': district_num, 'vogel_support': 0})
-    
-    vogel_by_district = pd.DataFrame(district_vogel)
+    # Calculate Vogel support by district (weighted by votes). Districts are
+    # numbered 1-9, so the totals are bincounts on the district number;
+    # precincts outside every district land in the unused bin 0, districts
+    # without precincts get 0, and blank vote counts add nothing (as in a
+    # NaN-skipping sum)
+    district = precinct_data['DISTRICT'].fillna(0).to_numpy(dtype=np.int64)
+    d_votes = np.bincount(district, weights=precinct_data['D_votes'].to_numpy(dtype=float, na_value=0), minlength=10)[1:10]
+    r_votes = np.bincount(district, weights=precinct_data['R_votes'].to_numpy(dtype=float, na_value=0), minlength=10)[1:10]
+    total_votes = d_votes + r_votes
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vogel_support = np.where(total_votes > 0, d_votes / total_votes * 100, 0)
+    vogel_by_district = pd.DataFrame({
+        'district_num': np.arange(1, 10),
+        'vogel_support': vogel_support,
+    })
     
     # Merge with demographics
     districts = districts.merge(vogel_by_district, on='district_num', how='left')
@@ -99,12 +124,17 @@ def main():
     x = districts['district_num'].astype(str)
     width = 0.6
     
+    # Segment heights as plain arrays, so the stack bottoms are simple
+    # array sums rather than index-aligned Series arithmetic
+    white = districts['pct_white'].to_numpy()
+    black = districts['pct_black'].to_numpy()
+    hispanic = districts['pct_hispanic'].to_numpy()
+    
     # Create stacked bars
-    p1 = ax1.bar(x, districts['pct_white'], width, label='White', color='#4a90e2', edgecolor='black', linewidth=0.5)
-    p2 = ax1.bar(x, districts['pct_black'], width, bottom=districts['pct_white'], 
+    p1 = ax1.bar(x, white, width, label='White', color='#4a90e2', edgecolor='black', linewidth=0.5)
+    p2 = ax1.bar(x, black, width, bottom=white, 
                  label='Black', color='#f5a623', edgecolor='black', linewidth=0.5)
-    p3 = ax1.bar(x, districts['pct_hispanic'], width, 
-                 bottom=districts['pct_white'] + districts['pct_black'],
+    p3 = ax1.bar(x, hispanic, width, bottom=white + black,
                  label='Hispanic', color='#7ed321', edgecolor='black', linewidth=0.5)
     
     ax1.set_ylabel('Percentage of Population', fontsize=12, fontweight='bold')
@@ -115,21 +145,16 @@ def main():
     ax1.set_ylim(0, 100)
     ax1.grid(axis='y', alpha=0.3)
     
-    # Add percentage labels on bars
-    for i, (idx, row) in enumerate(districts.iterrows()):
-        # White
-        if row['pct_white'] > 8:
-            ax1.text(i, row['pct_white']/2, f"{row['pct_white']:.0f}%", 
-                    ha='center', va='center', fontweight='bold', fontsize=9)
-        # Black
-        if row['pct_black'] > 8:
-            ax1.text(i, row['pct_white'] + row['pct_black']/2, f"{row['pct_black']:.0f}%", 
-                    ha='center', va='center', fontweight='bold', fontsize=9)
-        # Hispanic
-        if row['pct_hispanic'] > 3:
-            ax1.text(i, row['pct_white'] + row['pct_black'] + row['pct_hispanic']/2, 
-                    f"{row['pct_hispanic']:.0f}%", 
-                    ha='center', va='center', fontweight='bold', fontsize=8)
+    # Add percentage labels on bars, leaving segments too thin to fit one blank
+    def segment_labels(values, threshold):
+        return [f"{v:.0f}%" if v > threshold else '' for v in values]
+    
+    ax1.bar_label(p1, labels=segment_labels(white, 8),
+                  label_type='center', fontweight='bold', fontsize=9)
+    ax1.bar_label(p2, labels=segment_labels(black, 8),
+                  label_type='center', fontweight='bold', fontsize=9)
+    ax1.bar_label(p3, labels=segment_labels(hispanic, 3),
+                  label_type='center', fontweight='bold', fontsize=8)
     
     # Bottom panel: Vogel support
     bars = ax2.bar(x, districts['vogel_support'], width, 
@@ -146,10 +171,8 @@ def main():
     ax2.legend(loc='upper right', fontsize=10)
     
     # Add percentage labels on bars
-    for i, (bar, pct) in enumerate(zip(bars, districts['vogel_support'])):
-        height = bar.get_height()
-        ax2.text(bar.get_x() + bar.get_width()/2., height + 2,
-                f'{pct:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=10)
+    ax2.bar_label(bars, labels=[f'{pct:.1f}%' for pct in districts['vogel_support']],
+                  padding=3, fontweight='bold', fontsize=10)
     
     # Color legend for Vogel support
     ax2.text(0.02, 0.95, '■ Purple = Ross majority  ■ Orange = Vogel majority', 
@@ -170,10 +193,10 @@ def main():
     print("\n" + "="*80)
     print("COUNCIL DISTRICT SUMMARY")
     print("="*80)
-    for idx, row in summary.iterrows():
-        print(f"\nDistrict {row['district_num']}: {row['winner']} won ({row['vogel_support']:.1f}% Vogel)")
-        print(f"  Population: {row['population']:,.0f}")
-        print(f"  Demographics: {row['pct_white']:.1f}% White, {row['pct_black']:.1f}% Black, {row['pct_hispanic']:.1f}% Hispanic")
+    for row in summary.itertuples(index=False):
+        print(f"\nDistrict {row.district_num}: {row.winner} won ({row.vogel_support:.1f}% Vogel)")
+        print(f"  Population: {row.population:,.0f}")
+        print(f"  Demographics: {row.pct_white:.1f}% White, {row.pct_black:.1f}% Black, {row.pct_hispanic:.1f}% Hispanic")
     
     return 0
 
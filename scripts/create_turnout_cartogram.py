@@ -2,10 +2,13 @@
 """Generate a turnout cartogram for the 2025 election."""
 from __future__ import annotations
 
+import hashlib
+import json
 from pathlib import Path
 
 import geopandas as gpd
 import pandas as pd
+import pyogrio
 from cartogram import Cartogram
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -15,6 +18,27 @@ TURNOUT_CSV = RAW_DIR / "results_2025_turnout.csv"
 CD7_RESULTS_CSV = RAW_DIR / "results_2025_columbus_cd7.csv"
 SHAPEFILE_2025 = RAW_DIR / "precincts_2025" / "VotingPrecinct.shp"
 OUTPUT_GEOJSON = PROCESSED_CARTOGRAM_DIR / "results_2025_turnout.geojson"
+CARTOGRAM_CACHE_DIR = PROJECT_ROOT / "data" / "interim" / "cartograms"
+CARTOGRAM_ITERATIONS = 8
+# Decimal places for output lon/lat (6 places is ~0.1 m)
+GEOJSON_COORDINATE_PRECISION = 6
+
+
+def cartogram_cache_path(merged: gpd.GeoDataFrame, weight_col: str) -> Path:
+    """Cache file for a cartogram of merged, keyed on its inputs and settings."""
+    # Every shapefile component counts: attributes live in the .dbf and the
+    # CRS in the .prj, not just the geometry in the .shp
+    shapefile_parts = sorted(SHAPEFILE_2025.parent.glob(f"{SHAPEFILE_2025.stem}.*"))
+    key = hashlib.sha1(json.dumps({
+        "inputs": [
+            [path.name, path.stat().st_mtime_ns]
+            for path in (*shapefile_parts, TURNOUT_CSV, CD7_RESULTS_CSV)
+        ],
+        "weight_col": weight_col,
+        "weight_sum": float(merged[weight_col].sum()),
+        "iterations": CARTOGRAM_ITERATIONS,
+    }, sort_keys=True).encode()).hexdigest()
+    return CARTOGRAM_CACHE_DIR / f"{weight_col}-{key}.parquet"
 
 
 def main() -> None:
@@ -33,8 +57,17 @@ def main() -> None:
             "2025 precinct shapefile not found. Ensure VotingPrecinct.shp is present under data/raw/precincts_2025/."
         )
 
-    turnout_df = pd.read_csv(TURNOUT_CSV)
-    results_df = pd.read_csv(CD7_RESULTS_CSV)
+    # Only read the columns used below; non_voters and turnout_share are
+    # recomputed after the merge. Counts keep the inferred dtype so a blank
+    # cell reads as NaN instead of failing the load.
+    turnout_df = pd.read_csv(
+        TURNOUT_CSV,
+        usecols=["PRECINCT", "D_votes", "R_votes", "registered", "ballots"],
+    )
+    results_df = pd.read_csv(
+        CD7_RESULTS_CSV,
+        usecols=["PRECINCT", "D_votes", "R_votes"],
+    )
 
     turnout_df = turnout_df.rename(
         columns={
@@ -73,27 +106,49 @@ def main() -> None:
     merged["ross_votes"] = merged["ross_votes"].fillna(0)
     
     # Ensure ballots and registered are positive
-    if merged["registered"].le(0).any():
-        merged.loc[merged["registered"].le(0), "registered"] = 1
-    if merged["ballots"].le(0).any():
-        merged.loc[merged["ballots"].le(0), "ballots"] = 1
+    merged["registered"] = merged["registered"].clip(lower=1)
+    merged["ballots"] = merged["ballots"].clip(lower=1)
     
-    merged["non_voters"] = merged["registered"] - merged["ballots"]
-    merged.loc[merged["non_voters"] < 0, "non_voters"] = 0
-    merged["turnout_share"] = merged["ballots"] / merged["registered"].replace({0: pd.NA})
-    merged["turnout_share"] = merged["turnout_share"].fillna(0)
+    merged["non_voters"] = (merged["registered"] - merged["ballots"]).clip(lower=0)
+    merged["turnout_share"] = (merged["ballots"] / merged["registered"]).fillna(0)
 
     if merged.crs is None:
         merged = merged.set_crs("EPSG:3735")
 
-    carto_gdf = Cartogram(merged, "ballots", max_iterations=8)
+    # The diffusion dominates the runtime, so reuse the last result when the
+    # inputs are unchanged
+    cache_path = cartogram_cache_path(merged, "ballots")
+    if cache_path.exists():
+        carto_gdf = gpd.read_parquet(cache_path)
+    else:
+        # Only hand the weight and geometry to Cartogram: it copies its input
+        # and ships itself to the joblib workers on every iteration, so the
+        # attribute columns would just be extra pickling. They are
+        # reattached to the distorted geometry afterwards.
+        distorted = Cartogram(merged[["ballots", "geometry"]], "ballots", max_iterations=CARTOGRAM_ITERATIONS)
+        carto_gdf = merged.set_geometry(distorted.geometry.to_numpy())
+        CARTOGRAM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        carto_gdf.to_parquet(cache_path)
+        # Only the latest cartogram is kept; entries for older inputs or
+        # settings can never be hit again
+        for stale_path in CARTOGRAM_CACHE_DIR.glob("*.parquet"):
+            if stale_path != cache_path:
+                stale_path.unlink()
     carto_gdf = carto_gdf.to_crs("EPSG:4326")
 
     carto_gdf["vogel_share_pct"] = carto_gdf["vogel_share"].astype(float) * 100
     carto_gdf["turnout_pct"] = carto_gdf["turnout_share"].astype(float) * 100
 
     PROCESSED_CARTOGRAM_DIR.mkdir(parents=True, exist_ok=True)
-    carto_gdf.to_file(OUTPUT_GEOJSON, driver="GeoJSON")
+    pyogrio.write_dataframe(
+        carto_gdf,
+        OUTPUT_GEOJSON,
+        driver="GeoJSON",
+        layer_options={
+            "COORDINATE_PRECISION": str(GEOJSON_COORDINATE_PRECISION),
+            "RFC7946": "YES",
+        },
+    )
 
     total_ballots = int(carto_gdf["ballots"].sum())
     registered = int(carto_gdf["registered"].sum())
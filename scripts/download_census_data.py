@@ -7,12 +7,15 @@ Franklin County, Ohio FIPS: 39049
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import zipfile
-import io
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -26,6 +29,38 @@ CENSUS_DIR.mkdir(parents=True, exist_ok=True)
 STATE_FIPS = "39"
 COUNTY_FIPS = "049"
 
+# Shared keep-alive session: the TIGER downloads hit the same host, and
+# transient 5xx responses are retried with backoff. The final response is
+# still returned (not raised) so callers can report the HTTP status.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    max_retries=Retry(total=5, backoff_factor=0.5,
+                      status_forcelist=[500, 502, 503, 504],
+                      raise_on_status=False)))
+
+
+def download_and_extract_zip(url, output_dir, timeout):
+    """
+    Stream a ZIP archive to disk and extract it into output_dir.
+    
+    The archive is written in chunks rather than held in memory, then removed
+    after extraction. Returns False if the download fails.
+    """
+    zip_path = output_dir / '_download.zip'
+    with SESSION.get(url, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            logger.error(f"Failed to download: HTTP {response.status_code}")
+            return False
+        with open(zip_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+    
+    with zipfile.ZipFile(zip_path) as z:
+        z.extractall(output_dir)
+    zip_path.unlink()
+    return True
+
+
 def download_tiger_blocks(year=2020):
     """Download Census block shapefiles from TIGER/Line."""
     logger.info(f"Downloading {year} Census blocks for Ohio (will filter to Franklin County)...")
@@ -38,16 +73,9 @@ def download_tiger_blocks(year=2020):
     output_dir.mkdir(parents=True, exist_ok=True)
     
     logger.info(f"Fetching from {url} (this may take a minute...)")
-    response = requests.get(url, timeout=180)
-    
-    if response.status_code != 200:
-        logger.error(f"Failed to download: HTTP {response.status_code}")
+    if not download_and_extract_zip(url, output_dir, timeout=180):
         return None
     
-    # Extract ZIP
-    with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-        z.extractall(output_dir)
-    
     # Find the .shp file
     shp_files = list(output_dir.glob('*.shp'))
     if not shp_files:
@@ -57,14 +85,14 @@ def download_tiger_blocks(year=2020):
     shp_path = shp_files[0]
     logger.info(f"✓ Downloaded statewide blocks to {shp_path}")
     
-    # Filter to Franklin County only
+    # Filter to Franklin County only; the attribute filter runs inside OGR so
+    # the rest of the state's blocks are never decoded
     logger.info("Filtering to Franklin County...")
-    gdf = gpd.read_file(shp_path)
-    gdf_fc = gdf[gdf['COUNTYFP20'] == COUNTY_FIPS].copy()
+    gdf_fc = gpd.read_file(shp_path, engine='pyogrio', where=f"COUNTYFP20 = '{COUNTY_FIPS}'")
     
     # Save filtered version
-    output_path = output_dir / 'franklin_county_blocks.shp'
-    gdf_fc.to_file(output_path)
+    output_path = output_dir / 'franklin_county_blocks.gpkg'
+    gdf_fc.to_file(output_path, driver='GPKG', layer='blocks')
     logger.info(f"✓ Filtered to {len(gdf_fc):,} blocks in Franklin County")
     logger.info(f"  Saved to {output_path}")
     
@@ -75,6 +103,8 @@ def download_acs_demographics(year=2020):
     """
     Download ACS 5-year demographic data at block group level.
     
+    Saves the table as CSV and returns it as a DataFrame (None on failure).
+    
     Note: Most demographics are available at block group level, but detailed
     place-of-birth data (African ethnicity) is only available at tract level.
     We'll download both and merge them.
@@ -157,7 +187,7 @@ def download_acs_demographics(year=2020):
     }
     
     logger.info(f"Fetching from Census API: {base_url}")
-    response = requests.get(base_url, params=params, timeout=30)
+    response = SESSION.get(base_url, params=params, timeout=30)
     
     if response.status_code != 200:
         logger.error(f"Census API error: {response.status_code}")
@@ -166,31 +196,41 @@ def download_acs_demographics(year=2020):
     
     data = response.json()
     
-    # Convert to DataFrame
-    df = pd.DataFrame(data[1:], columns=data[0])
+    # Convert to DataFrame. The requested variables come first in each row,
+    # followed by the geography columns; all variables are coerced to float
+    # in a single pass over the flattened block rather than column by column
+    raw = np.array(data[1:], dtype=object)
+    n_vars = len(variables)
+    values = pd.to_numeric(raw[:, :n_vars].ravel(), errors='coerce').reshape(-1, n_vars)
+    df = pd.concat([
+        pd.DataFrame(values.astype(float), columns=data[0][:n_vars]),
+        pd.DataFrame(raw[:, n_vars:], columns=data[0][n_vars:]),
+    ], axis=1)
     
     # Create GEOID for joining with shapefiles
     df['GEOID'] = df['state'] + df['county'] + df['tract'] + df['block group']
     
-    # Convert numeric columns
-    for col in variables:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Calculate derived metrics
-    df['pct_college'] = (
-        (df['B15003_022E'] + df['B15003_023E'] + df['B15003_024E'] + df['B15003_025E']) / 
-        df['B15003_001E'] * 100
-    )
-    df['pct_white'] = df['B03002_003E'] / df['B03002_001E'] * 100
-    df['pct_black'] = df['B03002_004E'] / df['B03002_001E'] * 100
-    df['pct_hispanic'] = df['B03002_012E'] / df['B03002_001E'] * 100
-    df['pct_foreign_born'] = df['B05002_013E'] / df['B05002_001E'] * 100
-    df['pct_africa_born'] = df['B05006_091E'] / df['B05006_001E'] * 100
-    df['pct_east_africa_born'] = df['B05006_092E'] / df['B05006_001E'] * 100
-    df['pct_somalia_born'] = df['B05006_096E'] / df['B05006_001E'] * 100
-    df['pct_ethiopia_born'] = df['B05006_094E'] / df['B05006_001E'] * 100
-    df['pct_noncitizen'] = df['B05001_006E'] / df['B05006_001E'] * 100
-    df['pct_other_language'] = df['B16001_012E'] / df['B16001_001E'] * 100  # Includes African languages
+    # Calculate derived metrics: percentage -> (numerator columns, universe).
+    # All percentages are computed in one broadcast divide.
+    derived = {
+        'pct_college': (['B15003_022E', 'B15003_023E', 'B15003_024E', 'B15003_025E'], 'B15003_001E'),
+        'pct_white': (['B03002_003E'], 'B03002_001E'),
+        'pct_black': (['B03002_004E'], 'B03002_001E'),
+        'pct_hispanic': (['B03002_012E'], 'B03002_001E'),
+        'pct_foreign_born': (['B05002_013E'], 'B05002_001E'),
+        'pct_africa_born': (['B05006_091E'], 'B05006_001E'),
+        'pct_east_africa_born': (['B05006_092E'], 'B05006_001E'),
+        'pct_somalia_born': (['B05006_096E'], 'B05006_001E'),
+        'pct_ethiopia_born': (['B05006_094E'], 'B05006_001E'),
+        'pct_noncitizen': (['B05001_006E'], 'B05006_001E'),
+        'pct_other_language': (['B16001_012E'], 'B16001_001E'),  # Includes African languages
+    }
+    numerators = np.column_stack([
+        df[cols].to_numpy(dtype=float).sum(axis=1) for cols, _ in derived.values()
+    ])
+    universes = df[[universe for _, universe in derived.values()]].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df[list(derived)] = numerators / universes * 100
     
     # Rename for clarity
     df = df.rename(columns={
@@ -231,11 +271,18 @@ def download_acs_demographics(year=2020):
     logger.info(f"✓ Saved demographics to {output_path}")
     logger.info(f"  {len(df)} block groups with demographic data")
     
-    return output_path
+    return df
 
 
-def download_tiger_blockgroups(year=2020):
-    """Download Census block group shapefiles from TIGER/Line."""
+def download_tiger_blockgroups(year=2020, persist=True):
+    """
+    Download Census block group shapefiles from TIGER/Line.
+    
+    Returns the Franklin County block groups as a GeoDataFrame (None on
+    failure). The filtered layer is also saved as franklin_county_blockgroups.gpkg
+    unless persist is False, so merge_demographics_with_geography can still
+    be run on its own; main() hands the GeoDataFrame straight to the merge.
+    """
     logger.info(f"Downloading {year} Census block groups for Franklin County...")
     
     # TIGER/Line block group shapefile URL
@@ -245,16 +292,9 @@ def download_tiger_blockgroups(year=2020):
     output_dir.mkdir(parents=True, exist_ok=True)
     
     logger.info(f"Fetching from {url}")
-    response = requests.get(url, timeout=60)
-    
-    if response.status_code != 200:
-        logger.error(f"Failed to download: HTTP {response.status_code}")
+    if not download_and_extract_zip(url, output_dir, timeout=60):
         return None
     
-    # Extract ZIP
-    with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-        z.extractall(output_dir)
-    
     # Find the .shp file
     shp_files = list(output_dir.glob('*.shp'))
     if not shp_files:
@@ -264,38 +304,46 @@ def download_tiger_blockgroups(year=2020):
     shp_path = shp_files[0]
     logger.info(f"✓ Downloaded to {shp_path}")
     
-    # Filter to Franklin County only
-    gdf = gpd.read_file(shp_path)
-    gdf_fc = gdf[gdf['COUNTYFP'] == COUNTY_FIPS].copy()
+    # Filter to Franklin County only (attribute filter applied by OGR)
+    gdf_fc = gpd.read_file(shp_path, engine='pyogrio', where=f"COUNTYFP = '{COUNTY_FIPS}'")
     
-    # Save filtered version
-    output_path = output_dir / 'franklin_county_blockgroups.shp'
-    gdf_fc.to_file(output_path)
     logger.info(f"✓ Filtered to {len(gdf_fc)} block groups in Franklin County")
-    logger.info(f"  Saved to {output_path}")
     
-    return output_path
+    if persist:
+        output_path = output_dir / 'franklin_county_blockgroups.gpkg'
+        gdf_fc.to_file(output_path, driver='GPKG', layer='blockgroups')
+        logger.info(f"  Saved to {output_path}")
+    
+    return gdf_fc
 
 
-def merge_demographics_with_geography(year=2020):
-    """Merge demographic CSV with block group shapefile."""
+def merge_demographics_with_geography(year=2020, bg_gdf=None, demo_df=None):
+    """
+    Merge demographic data with block group geography.
+    
+    Uses the block groups / demographics passed in when given, otherwise
+    reads them from the files saved by the download functions
+    (franklin_county_blockgroups.gpkg and acs_{year}_demographics.csv).
+    """
     logger.info(f"Merging demographics with geography for {year}...")
     
     # Load demographics
-    demo_path = CENSUS_DIR / f'acs_{year}_demographics.csv'
-    if not demo_path.exists():
-        logger.error(f"Demographics file not found: {demo_path}")
-        return None
-    
-    demographics = pd.read_csv(demo_path)
+    if demo_df is None:
+        demo_path = CENSUS_DIR / f'acs_{year}_demographics.csv'
+        if not demo_path.exists():
+            logger.error(f"Demographics file not found: {demo_path}")
+            return None
+        demo_df = pd.read_csv(demo_path)
+    demographics = demo_df
     
     # Load block groups
-    bg_path = CENSUS_DIR / f'blockgroups_{year}' / 'franklin_county_blockgroups.shp'
-    if not bg_path.exists():
-        logger.error(f"Block groups shapefile not found: {bg_path}")
-        return None
-    
-    gdf = gpd.read_file(bg_path)
+    if bg_gdf is None:
+        bg_path = CENSUS_DIR / f'blockgroups_{year}' / 'franklin_county_blockgroups.gpkg'
+        if not bg_path.exists():
+            logger.error(f"Block groups file not found: {bg_path}")
+            return None
+        bg_gdf = gpd.read_file(bg_path)
+    gdf = bg_gdf
     
     # Ensure GEOID is string in both dataframes
     gdf['GEOID'] = gdf['GEOID'].astype(str)
@@ -334,26 +382,27 @@ def main():
     
     year = 2020  # Use 2020 Census
     
-    # Download Census blocks (for precise geographic crosswalk)
-    blocks_path = download_tiger_blocks(year)
-    if not blocks_path:
-        logger.error("Failed to download Census blocks")
-        return 1
-    
-    # Download block groups (for demographics)
-    bg_path = download_tiger_blockgroups(year)
-    if not bg_path:
-        logger.error("Failed to download block groups")
-        return 1
-    
-    # Download demographic data from ACS
-    demo_path = download_acs_demographics(year)
-    if not demo_path:
-        logger.error("Failed to download demographics")
-        return 1
-    
-    # Merge demographics with geography
-    merged_path = merge_demographics_with_geography(year)
+    # Census blocks (for precise geographic crosswalk), block groups (for
+    # demographics) and ACS demographic data are independent downloads, so
+    # fetch them concurrently
+    downloads = {
+        'Census blocks': download_tiger_blocks,
+        'block groups': download_tiger_blockgroups,
+        'demographics': download_acs_demographics,
+    }
+    with ThreadPoolExecutor(max_workers=len(downloads)) as pool:
+        futures = {name: pool.submit(download, year) for name, download in downloads.items()}
+    
+    results = {name: future.result() for name, future in futures.items()}
+    for name, result in results.items():
+        if result is None:
+            logger.error(f"Failed to download {name}")
+            return 1
+    
+    # Merge demographics with geography, reusing the block groups and
+    # demographics already in memory rather than re-reading them from disk
+    merged_path = merge_demographics_with_geography(
+        year, bg_gdf=results['block groups'], demo_df=results['demographics'])
     if not merged_path:
         logger.error("Failed to merge data")
         return 1
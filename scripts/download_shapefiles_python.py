@@ -4,11 +4,29 @@ Better shapefile downloader using Python requests with proper headers.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
+import random
 import time
 
 BASE_URL = "https://vote.franklincountyohio.gov"
 
+# Concurrent component downloads across all years; bounding this (rather
+# than sleeping between requests) is what keeps the load on the server polite
+DOWNLOAD_WORKERS = 4
+
+# One keep-alive session for every year, with a connection pool big enough
+# that each download worker keeps its own warm connection to the county
+# server instead of opening (and TLS-negotiating) a new one per file
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=DOWNLOAD_WORKERS))
+
+# Transient failures (rate limiting, server errors, timeouts) are retried
+# with exponential backoff; anything else fails straight away
+MAX_ATTEMPTS = 5
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
 # UUIDs for shapefile components by year
 # Format: {year: {filename: uuid}}
 SHAPEFILES = {
@@ -42,8 +60,36 @@ SHAPEFILES = {
 }
 
 
-def download_file(uuid, filename, output_path, session):
-    """Download a single file using requests with proper headers."""
+def _sleep_backoff(attempt, base=0.5, cap=8.0):
+    """Sleep a random time up to base * 2**attempt seconds (full jitter)."""
+    time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+def is_up_to_date(url, headers, output_path, session):
+    """
+    Check whether output_path already holds the whole remote file.
+    
+    Compares the local size with the Content-Length from a HEAD request;
+    any doubt (no local file, failed request, no length) means download.
+    """
+    if not output_path.exists():
+        return False
+    try:
+        response = session.head(url, headers=headers, timeout=10, allow_redirects=True)
+    except requests.RequestException:
+        return False
+    if response.status_code != 200 or 'text/html' in response.headers.get('Content-Type', ''):
+        return False
+    remote_size = int(response.headers.get('Content-Length', -1))
+    return output_path.stat().st_size == remote_size
+
+
+def download_file(uuid, filename, output_path, session, log=print):
+    """
+    Download a single file using requests with proper headers.
+    
+    Progress goes to log, one complete line per call.
+    """
     url = f"{BASE_URL}/getmedia/{uuid}/{filename}"
     
     headers = {
@@ -53,59 +99,90 @@ def download_file(uuid, filename, output_path, session):
         'Referer': 'https://vote.franklincountyohio.gov/maps-and-data/gis-shape-files',
     }
     
-    try:
-        print(f"  Downloading: {filename}...", end=" ", flush=True)
-        response = session.get(url, headers=headers, timeout=30, allow_redirects=True)
-        
-        # Check if we got HTML (error page) instead of binary data
-        content_type = response.headers.get('Content-Type', '')
-        if 'text/html' in content_type:
-            print("❌ Got HTML error page")
-            return False
-        
-        if response.status_code == 200:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_bytes(response.content)
-            size = len(response.content) / 1024  # KB
-            print(f"✓ ({size:.1f} KB)")
+    if is_up_to_date(url, headers, output_path, session):
+        size = output_path.stat().st_size / 1024  # KB
+        log(f"  {filename}: ✓ already downloaded ({size:.1f} KB)")
+        return True
+    
+    for attempt in range(MAX_ATTEMPTS):
+        retry = attempt < MAX_ATTEMPTS - 1
+        try:
+            # Stream the body straight to disk; the status and headers are
+            # checked before any of it is read
+            with session.get(url, headers=headers, timeout=30, allow_redirects=True, stream=True) as response:
+                if response.status_code in RETRY_STATUS_CODES and retry:
+                    log(f"  {filename}: HTTP {response.status_code}, retrying")
+                    _sleep_backoff(attempt)
+                    continue
+                
+                # Check if we got HTML (error page) instead of binary data
+                content_type = response.headers.get('Content-Type', '')
+                if 'text/html' in content_type:
+                    log(f"  {filename}: ❌ Got HTML error page")
+                    return False
+                
+                if response.status_code != 200:
+                    log(f"  {filename}: ❌ HTTP {response.status_code}")
+                    return False
+                
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        f.write(chunk)
+            
+            size = output_path.stat().st_size / 1024  # KB
+            log(f"  {filename}: ✓ ({size:.1f} KB)")
             return True
-        else:
-            print(f"❌ HTTP {response.status_code}")
+        
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if not retry:
+                log(f"  {filename}: ❌ Error: {e}")
+                return False
+            log(f"  {filename}: {type(e).__name__}, retrying")
+            _sleep_backoff(attempt)
+                
+        except Exception as e:
+            log(f"  {filename}: ❌ Error: {e}")
             return False
-            
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
 
 
-def download_year(year, data_dir="data/raw"):
-    """Download all shapefiles for a specific year."""
+def queue_year(year, pool, data_dir="data/raw"):
+    """
+    Submit every shapefile component of a year to pool.
+    
+    Returns the futures and the list the downloads log into, so the year's
+    output can be printed together once they finish (see report_year).
+    """
+    year_dir = Path(data_dir) / f"precincts_{year}"
+    lines = []
+    futures = [
+        pool.submit(download_file, uuid, filename, year_dir / filename, SESSION, lines.append)
+        for filename, uuid in SHAPEFILES.get(year, {}).items()
+    ]
+    return futures, lines
+
+
+def report_year(year, futures, lines):
+    """Wait for a year's downloads, then print its log and summary."""
     if year not in SHAPEFILES:
         print(f"❌ Year {year} not in shapefile database")
         return False
     
+    wait(futures)
+    success_count = sum(future.result() for future in futures)
+    
     print(f"\n{'='*60}")
     print(f"Downloading {year} shapefiles")
     print(f"{'='*60}")
-    
-    year_dir = Path(data_dir) / f"precincts_{year}"
-    files = SHAPEFILES[year]
-    
-    session = requests.Session()
-    success_count = 0
-    
-    for filename, uuid in files.items():
-        output_path = year_dir / filename
-        if download_file(uuid, filename, output_path, session):
-            success_count += 1
-        time.sleep(0.5)  # Be nice to the server
+    for line in lines:
+        print(line)
     
     print(f"\n{'='*60}")
-    if success_count == len(files):
+    if success_count == len(futures):
         print(f"✓ {year}: All {success_count} files downloaded successfully")
         return True
     else:
-        print(f"⚠ {year}: {success_count}/{len(files)} files downloaded")
+        print(f"⚠ {year}: {success_count}/{len(futures)} files downloaded")
         return False
 
 
@@ -140,14 +217,14 @@ def main():
     print("\nStarting in 3 seconds... (Ctrl+C to cancel)")
     time.sleep(3)
     
-    success = []
-    failed = []
+    # Every year's components share one bounded pool; each year is reported
+    # in order as soon as its own files are done
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        queued = [queue_year(year, pool) for year in years]
+        results = [report_year(year, *year_queue) for year, year_queue in zip(years, queued)]
     
-    for year in years:
-        if download_year(year):
-            success.append(year)
-        else:
-            failed.append(year)
+    success = [year for year, ok in zip(years, results) if ok]
+    failed = [year for year, ok in zip(years, results) if not ok]
     
     print(f"\n\n{'='*60}")
     print("DOWNLOAD SUMMARY")
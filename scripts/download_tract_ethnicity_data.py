@@ -8,7 +8,10 @@ disaggregate it to precincts.
 """
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 import requests
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 from pathlib import Path
@@ -27,6 +30,79 @@ STATE_FIPS = '39'  # Ohio
 COUNTY_FIPS = '049'  # Franklin County
 
 
+def parse_content_range(header):
+    """
+    Parse a Content-Range header into (first byte, complete length).
+    
+    Either value is None when the header is missing or gives '*'.
+    """
+    match = re.fullmatch(r'bytes (?:(\d+)-\d+|\*)/(\d+|\*)', (header or '').strip())
+    if not match:
+        return None, None
+    first, total = match.groups()
+    return (int(first) if first else None), (int(total) if total != '*' else None)
+
+
+def resumable_download(url, output_path, timeout):
+    """
+    Stream url to output_path, resuming a partial file left by an earlier run.
+    
+    The ETag (or Last-Modified) of each full download is kept next to the
+    file. If output_path already exists with a saved validator, only the
+    remaining bytes are requested, with a Range header guarded by If-Range:
+    a server whose copy has changed sends the whole file (HTTP 200), which
+    is rewritten from the start. A 206 is only appended when its
+    Content-Range starts at the end of the file on disk, and a 416 only
+    counts as complete when the reported length matches the file; on any
+    mismatch the partial file is discarded and the download restarted.
+    Returns False if the download fails.
+    """
+    validator_path = output_path.with_name(output_path.name + '.validator')
+    downloaded = 0
+    headers = {}
+    if output_path.exists() and validator_path.exists():
+        downloaded = output_path.stat().st_size
+        headers = {'Range': f'bytes={downloaded}-', 'If-Range': validator_path.read_text()}
+    
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        first, total = parse_content_range(response.headers.get('Content-Range'))
+        
+        if downloaded and response.status_code == 416:
+            if total == downloaded:
+                logger.info(f"  {output_path.name} already fully downloaded")
+                return True
+        elif response.status_code not in (200, 206):
+            logger.error(f"Failed to download: HTTP {response.status_code}")
+            return False
+        
+        if downloaded and response.status_code in (206, 416) and first != downloaded:
+            # The file on disk is not a prefix of the server's copy
+            logger.info(f"  {output_path.name} does not match the server copy, restarting download")
+            output_path.unlink()
+            validator_path.unlink()
+            return resumable_download(url, output_path, timeout)
+        
+        if response.status_code == 206:
+            logger.info(f"  Resuming download at byte {downloaded:,}")
+        else:
+            # Full download: remember what it was so a later resume can be
+            # validated (weak ETags are not allowed in If-Range)
+            etag = response.headers.get('ETag', '')
+            validator = etag if etag and not etag.startswith('W/') else response.headers.get('Last-Modified')
+            if validator:
+                validator_path.write_text(validator)
+            else:
+                validator_path.unlink(missing_ok=True)
+        
+        # Stream to disk in chunks rather than holding the file in memory
+        mode = 'ab' if response.status_code == 206 else 'wb'
+        with open(output_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+    
+    return True
+
+
 def download_tiger_tracts(year=2020):
     """Download Census tract shapefiles from TIGER/Line."""
     logger.info(f"Downloading {year} Census tracts for Franklin County...")
@@ -38,34 +114,25 @@ def download_tiger_tracts(year=2020):
     output_dir.mkdir(parents=True, exist_ok=True)
     
     logger.info(f"Fetching from {url}")
-    response = requests.get(url, timeout=60)
-    
-    if response.status_code != 200:
-        logger.error(f"Failed to download: HTTP {response.status_code}")
-        return None
-    
-    # Save and extract ZIP
     zip_path = output_dir / f'tl_{year}_{STATE_FIPS}_tract.zip'
-    with open(zip_path, 'wb') as f:
-        f.write(response.content)
-    
-    logger.info(f"Extracting to {output_dir}")
-    import zipfile
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(output_dir)
+    if not resumable_download(url, zip_path, timeout=60):
+        return None
     
-    # Find and load shapefile
-    shp_path = output_dir / f'tl_{year}_{STATE_FIPS}_tract.shp'
-    logger.info(f"✓ Downloaded to {shp_path}")
+    logger.info(f"✓ Downloaded to {zip_path}")
     
-    # Filter to Franklin County only
+    # Read the shapefile straight out of the ZIP (no extraction) and filter
+    # to Franklin County inside OGR, so the rest of the state's tracts are
+    # never decoded. Only GEOID is needed downstream (the ethnicity data
+    # joins on it); COUNTYFP has to be read for the filter to apply.
     logger.info("Filtering to Franklin County...")
-    gdf = gpd.read_file(shp_path)
-    gdf_fc = gdf[gdf['COUNTYFP'] == COUNTY_FIPS].copy()
-    
-    # Save filtered version
-    output_path = output_dir / 'franklin_county_tracts.shp'
-    gdf_fc.to_file(output_path)
+    shp_name = f'tl_{year}_{STATE_FIPS}_tract.shp'
+    gdf_fc = gpd.read_file(f'zip://{zip_path}!{shp_name}', engine='pyogrio',
+                           where=f"COUNTYFP = '{COUNTY_FIPS}'", columns=['GEOID', 'COUNTYFP'])
+    
+    # Save filtered version as GeoParquet: one compressed columnar file
+    # with full column names, and much faster to read back than a shapefile
+    output_path = output_dir / 'franklin_county_tracts.parquet'
+    gdf_fc.to_parquet(output_path, compression='zstd')
     logger.info(f"✓ Filtered to {len(gdf_fc):,} tracts in Franklin County")
     logger.info(f"  Saved to {output_path}")
     
@@ -167,15 +234,22 @@ def download_tract_ethnicity_data(year=2020):
     for col in all_vars:
         df[col] = pd.to_numeric(df[col], errors='coerce')
     
-    # Calculate percentages and rename columns
-    df['pct_africa_born'] = df['B05006_091E'] / df['B05006_001E'] * 100
-    df['pct_east_africa_born'] = df['B05006_092E'] / df['B05006_001E'] * 100
-    df['pct_somalia_born'] = df['B05006_096E'] / df['B05006_001E'] * 100
-    df['pct_ethiopia_born'] = df['B05006_094E'] / df['B05006_001E'] * 100
-    df['pct_nigeria_born'] = df['B05006_122E'] / df['B05006_001E'] * 100
-    df['pct_west_africa_born'] = df['B05006_119E'] / df['B05006_001E'] * 100
-    df['pct_foreign_born'] = df['B05002_013E'] / df['B05002_001E'] * 100
-    df['pct_noncitizen'] = df['B05001_006E'] / df['B05001_001E'] * 100
+    # Calculate percentages: percentage -> (numerator column, universe).
+    # All percentages are computed in one broadcast divide.
+    derived = {
+        'pct_africa_born': ('B05006_091E', 'B05006_001E'),
+        'pct_east_africa_born': ('B05006_092E', 'B05006_001E'),
+        'pct_somalia_born': ('B05006_096E', 'B05006_001E'),
+        'pct_ethiopia_born': ('B05006_094E', 'B05006_001E'),
+        'pct_nigeria_born': ('B05006_122E', 'B05006_001E'),
+        'pct_west_africa_born': ('B05006_119E', 'B05006_001E'),
+        'pct_foreign_born': ('B05002_013E', 'B05002_001E'),
+        'pct_noncitizen': ('B05001_006E', 'B05001_001E'),
+    }
+    numerators = df[[numerator for numerator, _ in derived.values()]].to_numpy(dtype=float)
+    universes = df[[universe for _, universe in derived.values()]].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df[list(derived)] = numerators / universes * 100
     
     # Rename raw count columns for clarity
     df = df.rename(columns={
@@ -243,7 +317,7 @@ def download_tract_ethnicity_data(year=2020):
 
 
 def merge_ethnicity_with_geography(year=2020):
-    """Merge ethnicity data with tract shapefile."""
+    """Merge ethnicity data with the filtered tract geometries."""
     logger.info(f"Merging ethnicity data with geography for {year}...")
     
     # Load ethnicity data
@@ -255,12 +329,12 @@ def merge_ethnicity_with_geography(year=2020):
     ethnicity = pd.read_csv(eth_path)
     
     # Load tracts
-    tract_path = CENSUS_DIR / f'tracts_{year}' / 'franklin_county_tracts.shp'
+    tract_path = CENSUS_DIR / f'tracts_{year}' / 'franklin_county_tracts.parquet'
     if not tract_path.exists():
-        logger.error(f"Tracts shapefile not found: {tract_path}")
+        logger.error(f"Tracts file not found: {tract_path}")
         return None
     
-    gdf = gpd.read_file(tract_path)
+    gdf = gpd.read_parquet(tract_path)
     
     # Ensure GEOID is string in both dataframes
     gdf['GEOID'] = gdf['GEOID'].astype(str)
@@ -271,7 +345,7 @@ def merge_ethnicity_with_geography(year=2020):
     
     # Save as GeoPackage
     output_path = CENSUS_DIR / f'franklin_county_tract_ethnicity_{year}.gpkg'
-    gdf_merged.to_file(output_path, driver='GPKG')
+    gdf_merged.to_file(output_path, driver='GPKG', engine='pyogrio')
     
     logger.info(f"✓ Merged ethnicity data with geography")
     logger.info(f"  {len(gdf_merged)} tracts total")
@@ -289,17 +363,19 @@ def main():
     
     year = 2020
     
-    # Download Census tracts
-    tract_path = download_tiger_tracts(year)
-    if not tract_path:
-        logger.error("Failed to download Census tracts")
-        return 1
+    # Census tracts (TIGER) and ethnicity data (ACS API) come from
+    # independent servers, so fetch them concurrently
+    downloads = {
+        'Census tracts': download_tiger_tracts,
+        'ethnicity data': download_tract_ethnicity_data,
+    }
+    with ThreadPoolExecutor(max_workers=len(downloads)) as pool:
+        futures = {name: pool.submit(download, year) for name, download in downloads.items()}
     
-    # Download ethnicity data from ACS
-    eth_path = download_tract_ethnicity_data(year)
-    if not eth_path:
-        logger.error("Failed to download ethnicity data")
-        return 1
+    for name, future in futures.items():
+        if not future.result():
+            logger.error(f"Failed to download {name}")
+            return 1
     
     # Merge with geography
     merged_path = merge_ethnicity_with_geography(year)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Extract 2025 turnout (ballots / registered) from the BOE Excel export."""
+from importlib.util import find_spec
 from pathlib import Path
 
 import pandas as pd
@@ -16,29 +17,38 @@ def main() -> None:
             "election file is downloaded into data/raw/boe_downloads/."
         )
 
-    df = pd.read_excel(EXCEL_PATH, sheet_name=0)
-
     required_cols = [
         "PRECINCT NAME",
         "REGISTERED VOTERS TOTAL",
         "BALLOTS CAST TOTAL",
     ]
+
+    # Only the three columns above are parsed. calamine (Rust) reads xlsx far
+    # faster than openpyxl, which is only used when python-calamine isn't
+    # installed; read errors from either engine are not swallowed.
+    engine = "calamine" if find_spec("python_calamine") else "openpyxl"
+    df = pd.read_excel(
+        EXCEL_PATH,
+        engine=engine,
+        sheet_name=0,
+        usecols=lambda col: col in required_cols,
+        dtype_backend="pyarrow",
+    )
+
     missing = [col for col in required_cols if col not in df.columns]
     if missing:
         raise ValueError(f"Missing expected columns in Excel file: {missing}")
 
     turnout = df[required_cols].copy()
     turnout = turnout.dropna(subset=["PRECINCT NAME"]).copy()
-    turnout["REGISTERED VOTERS TOTAL"] = (
-        pd.to_numeric(turnout["REGISTERED VOTERS TOTAL"], errors="coerce")
-        .fillna(0)
-        .astype(int)
-    )
-    turnout["BALLOTS CAST TOTAL"] = (
-        pd.to_numeric(turnout["BALLOTS CAST TOTAL"], errors="coerce")
-        .fillna(0)
-        .astype(int)
-    )
+    # Counts read as Arrow integers pass through to_numeric untouched; it
+    # only does real work when a column holds stray text (e.g. "N/A")
+    for col in ["REGISTERED VOTERS TOTAL", "BALLOTS CAST TOTAL"]:
+        turnout[col] = (
+            pd.to_numeric(turnout[col], errors="coerce", dtype_backend="pyarrow")
+            .fillna(0)
+            .astype("int64[pyarrow]")
+        )
     turnout = turnout[turnout["REGISTERED VOTERS TOTAL"] > 0]
 
     turnout["non_voters"] = (
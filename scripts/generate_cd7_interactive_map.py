@@ -5,16 +5,21 @@ Embeddable in the HTML analysis page.
 """
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import folium
 from folium.plugins import Fullscreen
 import json
 
+# Simplification tolerance for the web map, in degrees (~5 m here); far
+# below what is visible at the zoom levels the map is used at
+MAP_SIMPLIFY_TOLERANCE = 5e-5
+
 def main():
     print("Loading data...")
     
     # Load 2025 shapefile
-    shapefile = gpd.read_file('data/raw/precincts_2025/VotingPrecinct.shp')
+    shapefile = gpd.read_file('data/raw/precincts_2025/VotingPrecinct.shp', engine='pyogrio', columns=['NAME'])
     
     # Ensure CRS
     if shapefile.crs is None:
@@ -22,7 +27,10 @@ def main():
     shapefile = shapefile.to_crs('EPSG:4326')
     
     # Load CD7 results
-    results = pd.read_csv('data/raw/results_2025_columbus_cd7.csv')
+    # Precinct names are read as Arrow strings so the strip/upper
+    # normalization below runs as pyarrow compute kernels
+    results = pd.read_csv('data/raw/results_2025_columbus_cd7.csv',
+                          dtype={'PRECINCT': 'string[pyarrow]'})
     results['PRECINCT'] = results['PRECINCT'].str.strip().str.upper()
     
     # Calculate shares
@@ -30,12 +38,13 @@ def main():
     results['total_votes'] = results['D_votes'] + results['R_votes']
     
     # Merge
-    shapefile['PRECINCT'] = shapefile['NAME'].str.strip().str.upper()
+    shapefile['PRECINCT'] = shapefile['NAME'].astype('string[pyarrow]').str.strip().str.upper()
     merged = shapefile.merge(results[['PRECINCT', 'D_votes', 'R_votes', 'vogel_share', 'total_votes']], 
                              on='PRECINCT', how='left')
     
-    # Filter to Columbus only
-    columbus_precincts = merged[merged['NAME'].str.contains('COLUMBUS', case=False, na=False)].copy()
+    # Filter to Columbus only; PRECINCT is already upper-cased, so a plain
+    # substring test replaces the case-insensitive regex on NAME
+    columbus_precincts = merged[merged['PRECINCT'].str.contains('COLUMBUS', regex=False).fillna(False)].copy()
     
     print(f"Merged {len(columbus_precincts)} Columbus precincts")
     
@@ -54,53 +63,57 @@ def main():
     # Add fullscreen button
     Fullscreen(position='topleft').add_to(m)
     
-    # Create color scale (purple = Ross, orange = Vogel, white = 50-50)
-    def get_color(vogel_share):
-        if pd.isna(vogel_share):
-            return '#cccccc'
-        
-        if vogel_share >= 0.5:
-            # Vogel side: white to orange
-            intensity = (vogel_share - 0.5) * 2  # 0 to 1
-            r = 255
-            g = int(255 - intensity * 105)  # 255 to 150
-            b = int(255 - intensity * 205)  # 255 to 50
-        else:
-            # Ross side: white to purple
-            intensity = (0.5 - vogel_share) * 2  # 0 to 1
-            r = int(255 - intensity * 97)   # 255 to 158
-            g = int(255 - intensity * 195)  # 255 to 60
-            b = int(255 - intensity * 105)  # 255 to 150
-        
-        return f'#{r:02x}{g:02x}{b:02x}'
+    # Create color scale (purple = Ross, orange = Vogel, white = 50-50),
+    # computed for all precincts at once
+    def get_colors(vogel_share):
+        v = np.asarray(vogel_share, dtype=float)
+        vogel_side = v >= 0.5
+        # 0 at an even split, 1 at a unanimous precinct for either side
+        intensity = np.where(vogel_side, (v - 0.5) * 2, (0.5 - v) * 2)
+        rgb = np.column_stack([
+            # Vogel side: white to orange (255, 255 to 150, 255 to 50)
+            # Ross side: white to purple (255 to 158, 255 to 60, 255 to 150)
+            np.where(vogel_side, 255, 255 - intensity * 97),
+            np.where(vogel_side, 255 - intensity * 105, 255 - intensity * 195),
+            np.where(vogel_side, 255 - intensity * 205, 255 - intensity * 105),
+        ])
+        rgb = np.nan_to_num(rgb).astype(int)
+        colors = [f'#{r:02x}{g:02x}{b:02x}' for r, g, b in rgb.tolist()]
+        return np.where(np.isnan(v), '#cccccc', colors)
+    
+    # Drop sub-pixel vertices before the geometry is embedded in the page
+    columbus_precincts['geometry'] = columbus_precincts.geometry.simplify(
+        MAP_SIMPLIFY_TOLERANCE, preserve_topology=True)
+    
+    # Precompute each precinct's fill color and tooltip fields so the whole
+    # choropleth is one GeoJSON layer instead of one layer per precinct. The
+    # tooltip is laid out by Leaflet from these short properties at hover
+    # time rather than embedding a prebuilt HTML snippet per precinct.
+    columbus_precincts['color'] = get_colors(columbus_precincts['vogel_share'])
+    
+    has_data = columbus_precincts['vogel_share'].notna()
+    vogel_pct = columbus_precincts['vogel_share'] * 100
+    vote_count = '{:,.0f}'.format
+    columbus_precincts['vogel_str'] = (columbus_precincts['D_votes'].map(vote_count)
+                                       + ' (' + vogel_pct.map('{:.1f}%'.format) + ')').where(has_data, 'No data')
+    columbus_precincts['ross_str'] = (columbus_precincts['R_votes'].map(vote_count)
+                                      + ' (' + (100 - vogel_pct).map('{:.1f}%'.format) + ')').where(has_data, 'No data')
+    columbus_precincts['total_str'] = columbus_precincts['total_votes'].map(vote_count).where(has_data, 'No data')
+    
+    tooltip_fields = ['NAME', 'vogel_str', 'ross_str', 'total_str']
     
     # Add choropleth layer
-    for idx, row in columbus_precincts.iterrows():
-        vogel_share = row['vogel_share']
-        precinct_name = row['NAME']
-        
-        if pd.notna(vogel_share):
-            vogel_pct = vogel_share * 100
-            ross_pct = 100 - vogel_pct
-            tooltip_text = f"""
-            <b>{precinct_name}</b><br>
-            Vogel: {row['D_votes']:,.0f} ({vogel_pct:.1f}%)<br>
-            Ross: {row['R_votes']:,.0f} ({ross_pct:.1f}%)<br>
-            Total votes: {row['total_votes']:,.0f}
-            """
-        else:
-            tooltip_text = f"<b>{precinct_name}</b><br>No data"
-        
-        folium.GeoJson(
-            row['geometry'],
-            style_function=lambda x, color=get_color(vogel_share): {
-                'fillColor': color,
-                'color': '#666666',
-                'weight': 0.5,
-                'fillOpacity': 0.5  # Reduced from 0.7 to 0.5 for better street visibility
-            },
-            tooltip=folium.Tooltip(tooltip_text)
-        ).add_to(m)
+    folium.GeoJson(
+        columbus_precincts[['color'] + tooltip_fields + ['geometry']],
+        style_function=lambda feature: {
+            'fillColor': feature['properties']['color'],
+            'color': '#666666',
+            'weight': 0.5,
+            'fillOpacity': 0.5  # Reduced from 0.7 to 0.5 for better street visibility
+        },
+        tooltip=folium.GeoJsonTooltip(fields=tooltip_fields,
+                                      aliases=['Precinct', 'Vogel', 'Ross', 'Total votes'])
+    ).add_to(m)
     
     # Add legend
     legend_html = """
@@ -162,14 +175,19 @@ def main():
     """
     m.get_root().html.add_child(folium.Element(home_button_js))
     
+    # Render the page once; both copies get the same bytes
+    html = m.get_root().render()
+    
     # Save
     output_path = 'docs/cd7_election_map.html'
-    m.save(output_path)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html)
     print(f"Map saved to: {output_path}")
     
     # Also save a standalone version
     standalone_path = 'data/processed/maps/cd7_election_interactive.html'
-    m.save(standalone_path)
+    with open(standalone_path, 'w', encoding='utf-8') as f:
+        f.write(html)
     print(f"Standalone map saved to: {standalone_path}")
 
 if __name__ == '__main__':
@@ -5,20 +5,54 @@ Generate a PDF report for Columbus City Council District 7 race analysis.
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # The report is only written to PDF
 import matplotlib.pyplot as plt
-import seaborn as sns
 from matplotlib.backends.backend_pdf import PdfPages
+from PIL import Image
 from datetime import datetime
 import textwrap
 
-# Set style
-sns.set_style("whitegrid")
+# Set style: the rcParams seaborn's "whitegrid" style sets, applied directly
+# so the report does not need to import seaborn
+plt.rcParams.update({
+    'axes.grid': True,
+    'axes.axisbelow': True,
+    'axes.edgecolor': '.8',
+    'axes.labelcolor': '.15',
+    'grid.color': '.8',
+    'text.color': '.15',
+    'xtick.color': '.15',
+    'ytick.color': '.15',
+    'xtick.bottom': False,
+    'ytick.left': False,
+    'patch.edgecolor': 'w',
+    'patch.force_edgecolor': True,
+    'lines.solid_capstyle': 'round',
+    'font.sans-serif': ['Arial', 'DejaVu Sans', 'Liberation Sans', 'Bitstream Vera Sans', 'sans-serif'],
+})
 plt.rcParams['figure.figsize'] = (11, 8.5)  # Letter size
 plt.rcParams['font.size'] = 10
 
-def create_title_page(pdf):
+# Columns correlated against Vogel's vote share (Vogel_share last)
+CORRELATION_COLUMNS = ['pct_black', 'pct_college', 'median_income', 'pct_white', 'Vogel_share']
+
+# Shared wrapper for text-page paragraphs
+TEXT_WRAPPER = textwrap.TextWrapper(width=90)
+
+# Figure.clear() keeps the subplot parameters set by tight_layout(), so each
+# page restores these defaults explicitly
+SUBPLOT_PARAMS = ('left', 'bottom', 'right', 'top', 'wspace', 'hspace')
+
+def start_page(fig, figsize):
+    """Clear the shared report figure and size it for a new page."""
+    fig.clear()
+    fig.set_size_inches(figsize)
+    fig.subplots_adjust(**{param: plt.rcParams[f'figure.subplot.{param}'] for param in SUBPLOT_PARAMS})
+
+def create_title_page(pdf, fig):
     """Create a title page."""
-    fig = plt.figure(figsize=(8.5, 11))
+    start_page(fig, (8.5, 11))
     fig.text(0.5, 0.6, 'Columbus City Council District 7\nElection Analysis', 
              ha='center', va='center', fontsize=24, weight='bold')
     fig.text(0.5, 0.5, '2025 General Election', 
@@ -29,13 +63,12 @@ def create_title_page(pdf):
              ha='center', va='center', fontsize=12)
     fig.text(0.5, 0.1, f'Generated: {datetime.now().strftime("%B %d, %Y")}', 
              ha='center', va='center', fontsize=10, style='italic')
-    plt.axis('off')
+    fig.add_subplot(111).axis('off')
     pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
 
-def create_text_page(pdf, title, text, fontsize=10):
+def create_text_page(pdf, fig, title, text, fontsize=10):
     """Create a page with text content."""
-    fig = plt.figure(figsize=(8.5, 11))
+    start_page(fig, (8.5, 11))
     ax = fig.add_subplot(111)
     ax.axis('off')
     
@@ -47,7 +80,7 @@ def create_text_page(pdf, title, text, fontsize=10):
     wrapped_lines = []
     for paragraph in text.split('\n\n'):
         if paragraph.strip():
-            wrapped = textwrap.fill(paragraph.strip(), width=90)
+            wrapped = TEXT_WRAPPER.fill(paragraph.strip())
             wrapped_lines.append(wrapped)
     
     full_text = '\n\n'.join(wrapped_lines)
@@ -55,11 +88,11 @@ def create_text_page(pdf, title, text, fontsize=10):
             family='monospace', transform=ax.transAxes)
     
     pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
 
-def create_summary_statistics_page(pdf, merged):
+def create_summary_statistics_page(pdf, fig, merged):
     """Create a page with summary statistics."""
-    fig, axes = plt.subplots(2, 2, figsize=(11, 8.5))
+    start_page(fig, (11, 8.5))
+    axes = fig.subplots(2, 2)
     fig.suptitle('Columbus Citywide Election Summary', fontsize=16, weight='bold', y=0.98)
     
     # Overall results
@@ -86,9 +119,13 @@ Margin: {abs(vogel_pct - 50)*2:.1f} percentage points
             family='monospace', transform=ax.transAxes)
     
     # Vote distribution by precinct
+    # Histograms are binned with np.histogram and drawn as plain bars;
+    # precincts with no votes in the race (NaN share) or a blank vote count
+    # (NaN total) are left out
     ax = axes[0, 1]
-    merged['Vogel_share'] = merged['D_votes'] / (merged['D_votes'] + merged['R_votes'])
-    ax.hist(merged['Vogel_share'] * 100, bins=30, edgecolor='black', alpha=0.7)
+    vogel_share = merged['Vogel_share'].to_numpy() * 100
+    counts, edges = np.histogram(vogel_share[~np.isnan(vogel_share)], bins=30)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='black', alpha=0.7)
     ax.axvline(50, color='red', linestyle='--', linewidth=2, label='50% threshold')
     ax.set_xlabel('Vogel Vote Share (%)')
     ax.set_ylabel('Number of Precincts')
@@ -98,8 +135,10 @@ Margin: {abs(vogel_pct - 50)*2:.1f} percentage points
     
     # Precinct size distribution
     ax = axes[1, 0]
-    merged['total_votes'] = merged['D_votes'] + merged['R_votes']
-    ax.hist(merged['total_votes'], bins=30, edgecolor='black', alpha=0.7, color='green')
+    total_votes = merged['total_votes'].to_numpy(dtype=float)
+    counts, edges = np.histogram(total_votes[~np.isnan(total_votes)], bins=30)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='black', alpha=0.7,
+           color='green')
     ax.set_xlabel('Total Votes per Precinct')
     ax.set_ylabel('Number of Precincts')
     ax.set_title('Precinct Size Distribution')
@@ -119,20 +158,16 @@ Margin: {abs(vogel_pct - 50)*2:.1f} percentage points
                 f'{int(height)}',
                 ha='center', va='bottom', fontsize=12, weight='bold')
     
-    plt.tight_layout()
+    fig.tight_layout()
     pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
 
-def create_demographic_analysis_page(pdf, merged):
+def create_demographic_analysis_page(pdf, fig, merged_clean, vogel_corr):
     """Create correlation analysis page."""
-    fig, axes = plt.subplots(2, 2, figsize=(11, 8.5))
+    start_page(fig, (11, 8.5))
+    axes = fig.subplots(2, 2)
     fig.suptitle('Demographic Correlations with Vogel Support (Citywide)', 
                  fontsize=16, weight='bold', y=0.98)
     
-    # Clean data
-    merged_clean = merged[['pct_black', 'pct_college', 'median_income', 
-                           'pct_white', 'Vogel_share']].dropna()
-    
     # Scatter plots
     demographic_vars = [
         ('pct_college', '% College Degree', axes[0, 0]),
@@ -152,7 +187,7 @@ def create_demographic_analysis_page(pdf, merged):
         ax.plot(x_line, p(x_line), "r--", alpha=0.8, linewidth=2)
         
         # Correlation coefficient
-        corr = merged_clean[var].corr(merged_clean['Vogel_share'])
+        corr = vogel_corr[var]
         ax.text(0.05, 0.95, f'r = {corr:+.3f}', transform=ax.transAxes,
                 fontsize=11, weight='bold', va='top',
                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
@@ -161,27 +196,28 @@ def create_demographic_analysis_page(pdf, merged):
         ax.set_ylabel('Vogel Vote Share (%)')
         ax.grid(alpha=0.3)
     
-    plt.tight_layout()
+    fig.tight_layout()
     pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
 
-def create_majority_black_comparison_page(pdf, merged):
+def create_majority_black_comparison_page(pdf, fig, merged):
     """Create comparison between majority-Black and other precincts."""
-    fig, axes = plt.subplots(2, 2, figsize=(11, 8.5))
+    start_page(fig, (11, 8.5))
+    axes = fig.subplots(2, 2)
     fig.suptitle('Majority-Black Precincts vs. Other Precincts (Citywide)', 
                  fontsize=16, weight='bold', y=0.98)
     
-    # Split data
-    majority_black = merged[merged['pct_black'] > 50].copy()
-    other = merged[merged['pct_black'] <= 50].copy()
+    # Split data with boolean masks over the raw arrays (precincts without
+    # pct_black fall in neither group)
+    pct_black = merged['pct_black'].to_numpy()
+    groups = [pct_black > 50, pct_black <= 50]
+    vogel_share = merged['Vogel_share'].to_numpy() * 100
+    d_votes = merged['D_votes'].to_numpy(dtype=float, na_value=np.nan)
+    r_votes = merged['R_votes'].to_numpy(dtype=float, na_value=np.nan)
     
     # Vote share comparison
     ax = axes[0, 0]
     categories = ['Majority-Black\nPrecincts', 'Other\nPrecincts']
-    vogel_shares = [
-        majority_black['Vogel_share'].mean() * 100,
-        other['Vogel_share'].mean() * 100
-    ]
+    vogel_shares = [np.nanmean(vogel_share[mask]) for mask in groups]
     bars = ax.bar(categories, vogel_shares, color=['#8c564b', '#e377c2'], 
                    edgecolor='black', width=0.6)
     ax.axhline(50, color='red', linestyle='--', linewidth=2, alpha=0.5)
@@ -197,7 +233,7 @@ def create_majority_black_comparison_page(pdf, merged):
     
     # Precinct count
     ax = axes[0, 1]
-    counts = [len(majority_black), len(other)]
+    counts = [np.count_nonzero(mask) for mask in groups]
     bars = ax.bar(categories, counts, color=['#8c564b', '#e377c2'], 
                    edgecolor='black', width=0.6)
     ax.set_ylabel('Number of Precincts')
@@ -210,10 +246,7 @@ def create_majority_black_comparison_page(pdf, merged):
     
     # Total votes
     ax = axes[1, 0]
-    vote_counts = [
-        majority_black['D_votes'].sum() + majority_black['R_votes'].sum(),
-        other['D_votes'].sum() + other['R_votes'].sum()
-    ]
+    vote_counts = [np.nansum(d_votes[mask]) + np.nansum(r_votes[mask]) for mask in groups]
     bars = ax.bar(categories, vote_counts, color=['#8c564b', '#e377c2'], 
                    edgecolor='black', width=0.6)
     ax.set_ylabel('Total Votes Cast')
@@ -226,10 +259,7 @@ def create_majority_black_comparison_page(pdf, merged):
     
     # Box plot of Vogel support distribution
     ax = axes[1, 1]
-    data_to_plot = [
-        majority_black['Vogel_share'] * 100,
-        other['Vogel_share'] * 100
-    ]
+    data_to_plot = [vogel_share[mask] for mask in groups]
     bp = ax.boxplot(data_to_plot, labels=categories, patch_artist=True,
                     widths=0.6)
     for patch, color in zip(bp['boxes'], ['#8c564b', '#e377c2']):
@@ -239,28 +269,23 @@ def create_majority_black_comparison_page(pdf, merged):
     ax.set_title('Distribution of Vogel Support')
     ax.grid(alpha=0.3, axis='y')
     
-    plt.tight_layout()
+    fig.tight_layout()
     pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
 
-def create_correlation_summary_page(pdf, merged):
+def create_correlation_summary_page(pdf, fig, merged_clean, vogel_corr):
     """Create a correlation summary table."""
-    fig = plt.figure(figsize=(8.5, 11))
+    start_page(fig, (8.5, 11))
     ax = fig.add_subplot(111)
     ax.axis('off')
     
     ax.text(0.5, 0.95, 'Correlation Analysis Summary', ha='center', va='top', 
             fontsize=14, weight='bold', transform=ax.transAxes)
     
-    # Calculate correlations
-    merged_clean = merged[['pct_black', 'pct_college', 'median_income', 
-                           'pct_white', 'Vogel_share']].dropna()
-    
     correlations = {
-        '% College Degree': merged_clean['pct_college'].corr(merged_clean['Vogel_share']),
-        '% Black': merged_clean['pct_black'].corr(merged_clean['Vogel_share']),
-        '% White (Non-Hispanic)': merged_clean['pct_white'].corr(merged_clean['Vogel_share']),
-        'Median Income': merged_clean['median_income'].corr(merged_clean['Vogel_share']),
+        '% College Degree': vogel_corr['pct_college'],
+        '% Black': vogel_corr['pct_black'],
+        '% White (Non-Hispanic)': vogel_corr['pct_white'],
+        'Median Income': vogel_corr['median_income'],
     }
     
     sorted_corr = sorted(correlations.items(), key=lambda x: abs(x[1]), reverse=True)
@@ -323,34 +348,53 @@ and an establishment Democrat (Ross). The results show an
             family='monospace', transform=ax.transAxes)
     
     pdf.savefig(fig, bbox_inches='tight')
-    plt.close()
 
 def main():
     """Generate the PDF report."""
     print("Loading data...")
     
     # Load data
-    demo = pd.read_csv('data/processed/demographics_by_precinct_2025.csv')
+    # Precinct names are read as Arrow strings so the strip/upper
+    # normalization below runs as pyarrow compute kernels
+    demo = pd.read_csv('data/processed/demographics_by_precinct_2025.csv', engine='pyarrow',
+                       usecols=['PRECINCT', 'pct_black', 'pct_college', 'median_income', 'pct_white'],
+                       dtype={'PRECINCT': 'string[pyarrow]'})
     demo['PRECINCT'] = demo['PRECINCT'].str.strip().str.upper()
     
-    vogel = pd.read_csv('data/raw/results_2025_columbus_cd7.csv')
+    vogel = pd.read_csv('data/raw/results_2025_columbus_cd7.csv', engine='pyarrow',
+                        usecols=['PRECINCT', 'D_votes', 'R_votes'],
+                        dtype={'PRECINCT': 'string[pyarrow]', 'D_votes': 'Int32', 'R_votes': 'Int32'})
     vogel['PRECINCT'] = vogel['PRECINCT'].str.strip().str.upper()
     
     # Merge
-    merged = demo.merge(vogel[['PRECINCT', 'D_votes', 'R_votes']], 
-                       on='PRECINCT', how='inner')
-    merged['Vogel_share'] = merged['D_votes'] / (merged['D_votes'] + merged['R_votes'])
+    merged = demo.merge(vogel, on='PRECINCT', how='inner')
+    # Vote counts are nullable so a blank cell loads as NA; it becomes NaN here
+    d_votes = merged['D_votes'].to_numpy(dtype=float, na_value=np.nan)
+    total = d_votes + merged['R_votes'].to_numpy(dtype=float, na_value=np.nan)
+    merged['total_votes'] = total
+    # Precincts with no votes in the race (or a blank count) get a NaN share
+    merged['Vogel_share'] = np.divide(d_votes, total, out=np.full(len(total), np.nan),
+                                      where=total > 0)
     
     print(f"Merged data: {len(merged)} Columbus precincts")
     
+    # Pearson r of each demographic with Vogel_share, from one correlation
+    # matrix over the precincts with complete demographic data
+    merged_clean = merged[CORRELATION_COLUMNS].dropna()
+    corr_matrix = np.corrcoef(merged_clean.to_numpy(dtype=np.float64), rowvar=False)
+    vogel_corr = dict(zip(CORRELATION_COLUMNS, corr_matrix[:, -1]))
+    
     # Create PDF
     output_path = 'data/processed/district_analysis/CD7_Race_Analysis_Report.pdf'
     print(f"Generating PDF: {output_path}")
     
+    # One figure is cleared and reused for every page
+    fig = plt.figure()
+    
     with PdfPages(output_path) as pdf:
         # Title page
         print("  - Creating title page...")
-        create_title_page(pdf)
+        create_title_page(pdf, fig)
         
         # Overview text
         print("  - Creating overview...")
@@ -374,23 +418,23 @@ Analysis includes:
 • Comparison of majority-Black vs. other precincts
 • Geographic clustering analysis
 """
-        create_text_page(pdf, 'Overview', overview)
+        create_text_page(pdf, fig, 'Overview', overview)
         
         # Summary statistics
         print("  - Creating summary statistics...")
-        create_summary_statistics_page(pdf, merged)
+        create_summary_statistics_page(pdf, fig, merged)
         
         # Demographic analysis
         print("  - Creating demographic analysis...")
-        create_demographic_analysis_page(pdf, merged)
+        create_demographic_analysis_page(pdf, fig, merged_clean, vogel_corr)
         
         # Majority-Black comparison
         print("  - Creating majority-Black comparison...")
-        create_majority_black_comparison_page(pdf, merged)
+        create_majority_black_comparison_page(pdf, fig, merged)
         
         # Correlation summary
         print("  - Creating correlation summary...")
-        create_correlation_summary_page(pdf, merged)
+        create_correlation_summary_page(pdf, fig, merged_clean, vogel_corr)
         
         # Add existing visualizations if they exist
         import os
@@ -404,14 +448,24 @@ Analysis includes:
         for plot_path, title in existing_plots:
             if os.path.exists(plot_path):
                 print(f"  - Adding {title}...")
-                fig = plt.figure(figsize=(11, 8.5))
-                ax = fig.add_subplot(111)
-                img = plt.imread(plot_path)
-                ax.imshow(img)
-                ax.axis('off')
-                ax.set_title(title, fontsize=14, weight='bold', pad=20)
-                pdf.savefig(fig, bbox_inches='tight')
-                plt.close()
+                # Embed the PNG pixel-for-pixel with figimage, plus a strip
+                # above it for the title. Images larger than the report's
+                # letter-size page (at the figure DPI) are downscaled once
+                # so the page never exceeds it.
+                title_height = 0.6
+                page_width, max_page_height = plt.rcParams['figure.figsize']
+                with Image.open(plot_path) as image:
+                    image.thumbnail((int(page_width * fig.dpi),
+                                     int((max_page_height - title_height) * fig.dpi)),
+                                    Image.LANCZOS)
+                    img = np.asarray(image)
+                height, width = img.shape[:2]
+                page_height = height / fig.dpi + title_height
+                start_page(fig, (width / fig.dpi, page_height))
+                fig.figimage(img, xo=0, yo=0)
+                fig.text(0.5, 1 - title_height / 2 / page_height, title,
+                         ha='center', va='center', fontsize=14, weight='bold')
+                pdf.savefig(fig)
         
         # Metadata
         d = pdf.infodict()
@@ -421,6 +475,8 @@ Analysis includes:
         d['Keywords'] = 'Columbus, City Council, Election Analysis, Demographics'
         d['CreationDate'] = datetime.now()
     
+    plt.close(fig)
+    
     print(f"\nPDF report generated successfully: {output_path}")
     print(f"File size: {os.path.getsize(output_path) / 1024:.1f} KB")
 
@@ -0,0 +1,88 @@
+"""
+Loading helpers shared by the precinct scripts.
+
+Vector layers (and precinct layers reprojected once) are cached as
+GeoParquet under data/interim, so later runs (or other scripts reading the
+same file) skip the OGR parse and the reprojection. A cache is reused only
+while it is newer than every file it was built from. Also holds the
+precinct ID normalization used to join results, demographics and shapes.
+"""
+
+import logging
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from pyproj import Transformer
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = PROJECT_ROOT / 'data' / 'interim' / 'geoparquet'
+
+
+def cache_is_fresh(cache_path, sources):
+    """True if cache_path exists and is at least as new as every source file."""
+    if not cache_path.exists():
+        return False
+    cache_mtime = cache_path.stat().st_mtime
+    return all(cache_mtime >= Path(source).stat().st_mtime for source in sources)
+
+
+def read_file_cached(path, cache_path, sources=(), **kwargs):
+    """
+    Read a vector file, caching it as GeoParquet for subsequent runs.
+
+    The cache is reused as long as it is newer than the source file and any
+    other files the read depends on (sources), e.g. the layer a bbox filter
+    was derived from. Extra keyword arguments go to gpd.read_file.
+    """
+    if cache_is_fresh(cache_path, (path, *sources)):
+        logger.info(f"  Using cached {cache_path.name}")
+        return gpd.read_parquet(cache_path)
+
+    gdf = gpd.read_file(path, engine='pyogrio', **kwargs)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    gdf.to_parquet(cache_path, compression='zstd')
+    return gdf
+
+
+def normalize_precinct_ids(ids):
+    """
+    Strip and upper-case precinct IDs, returning a categorical.
+
+    The string normalization runs once per distinct name, not once per row.
+    """
+    return (ids.astype('category')
+               .map(lambda name: name.strip().upper(), na_action='ignore')
+               .astype('category'))
+
+
+def fast_to_crs(gdf, crs):
+    """Reproject gdf to crs with one bulk pyproj transform over all vertices."""
+    transformer = Transformer.from_crs(gdf.crs, crs, always_xy=True)
+    geoms = shapely.transform(
+        gdf.geometry.values,
+        lambda coords: np.column_stack(transformer.transform(coords[:, 0], coords[:, 1])),
+    )
+    return gdf.set_geometry(gpd.GeoSeries(geoms, index=gdf.index, crs=crs))
+
+
+def load_precincts_cached(shp_path, crs):
+    """
+    Load a precinct shapefile reprojected to crs.
+
+    The reprojected layer is cached as GeoParquet in CACHE_DIR, named after
+    the shapefile's directory and the CRS (e.g. precincts_2017.epsg3747.parquet),
+    and reused while it is newer than the shapefile.
+    """
+    shp_path = Path(shp_path)
+    cache_path = CACHE_DIR / f"{shp_path.parent.name}.{crs.replace(':', '').lower()}.parquet"
+    if cache_is_fresh(cache_path, (shp_path,)):
+        return gpd.read_parquet(cache_path)
+
+    gdf = fast_to_crs(gpd.read_file(shp_path, engine='pyogrio'), crs)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    gdf.to_parquet(cache_path, compression='zstd')
+    return gdf
@@ -0,0 +1,114 @@
+"""
+Precinct/census-polygon overlay shared by the precinct aggregation scripts.
+
+Intersects precinct boundaries with Census polygons (block groups or tracts)
+and keeps only the slim result needed for areal allocation: precinct ID,
+GEOID, intersection area, and the fraction of the Census polygon that falls
+in the precinct. The result carries no geometry, so it can be cached as
+Parquet and reused by later runs (or by other scripts using the same layers)
+without repeating the geometric intersection.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from precinct_io import cache_is_fresh
+
+logger = logging.getLogger(__name__)
+
+# Smallest number of candidate pairs worth handing to a separate thread
+MIN_PAIRS_PER_THREAD = 2000
+
+
+def _intersection_areas(left, right):
+    """
+    Areas of the pairwise intersections of two equal-length geometry arrays.
+    
+    Large pair lists are split into contiguous chunks intersected on a thread
+    pool; GEOS operations release the GIL, so the chunks run concurrently.
+    """
+    n_chunks = min(os.cpu_count() or 1, len(left) // MIN_PAIRS_PER_THREAD)
+    if n_chunks <= 1:
+        return shapely.area(shapely.intersection(left, right))
+    
+    bounds = np.linspace(0, len(left), n_chunks + 1, dtype=int)
+    chunks = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+    with ThreadPoolExecutor(max_workers=n_chunks) as pool:
+        areas = pool.map(lambda chunk: shapely.area(shapely.intersection(left[chunk], right[chunk])), chunks)
+        return np.concatenate(list(areas))
+
+
+def compute_precinct_overlay(precincts, census, precinct_id_col):
+    """
+    Intersect precincts with Census polygons.
+
+    Args:
+        precincts: Precinct GeoDataFrame
+        census: Census GeoDataFrame with a GEOID column, in the same CRS
+        precinct_id_col: Precinct ID column in precincts
+
+    Returns:
+        DataFrame with [precinct_id_col, 'GEOID', 'intersection_area', 'area_fraction']
+        for every pair with a positive-area intersection
+    """
+    precinct_geoms = precincts.geometry.to_numpy()
+    census_geoms = census.geometry.to_numpy()
+
+    # One bulk STRtree query for all intersecting pairs. The smaller layer is
+    # prepared and used as the query side so GEOS can reuse its edge index.
+    if len(census_geoms) < len(precinct_geoms):
+        shapely.prepare(census_geoms)
+        tree = shapely.STRtree(precinct_geoms)
+        census_idx, precinct_idx = tree.query(census_geoms, predicate='intersects')
+    else:
+        shapely.prepare(precinct_geoms)
+        tree = shapely.STRtree(census_geoms)
+        precinct_idx, census_idx = tree.query(precinct_geoms, predicate='intersects')
+
+    # Vectorized intersection areas for all pairs, split across threads
+    intersection_area = _intersection_areas(precinct_geoms[precinct_idx], census_geoms[census_idx])
+    census_area = shapely.area(census_geoms)[census_idx]
+
+    # Taking from the underlying array keeps a categorical precinct ID's dtype
+    overlay = pd.DataFrame({
+        precinct_id_col: precincts[precinct_id_col].array.take(precinct_idx),
+        'GEOID': census['GEOID'].to_numpy()[census_idx],
+        'intersection_area': intersection_area,
+        'area_fraction': intersection_area / census_area,
+    })
+
+    # Drop pairs that only share a boundary
+    return overlay[overlay['intersection_area'] > 0].reset_index(drop=True)
+
+
+def build_precinct_overlay(precincts, census, precinct_id_col, cache_path=None, sources=()):
+    """
+    Return the precinct/Census overlay, using a Parquet cache when available.
+
+    Args:
+        precincts: Precinct GeoDataFrame
+        census: Census GeoDataFrame with a GEOID column, in the same CRS
+        precinct_id_col: Precinct ID column in precincts
+        cache_path: Parquet file to read from / write to (no caching if None)
+        sources: Input files the overlay was built from; the cache is only
+            reused when it is newer than all of them
+
+    Returns:
+        DataFrame as returned by compute_precinct_overlay
+    """
+    if cache_path is not None and cache_is_fresh(cache_path, sources):
+        logger.info(f"  Using cached overlay {cache_path.name}")
+        return pd.read_parquet(cache_path)
+
+    overlay = compute_precinct_overlay(precincts, census, precinct_id_col)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        overlay.to_parquet(cache_path, compression='zstd', index=False)
+
+    return overlay
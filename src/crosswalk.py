@@ -4,6 +4,7 @@ import logging
 
 import geopandas as gpd
 import pandas as pd
+import shapely
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +101,7 @@ def _build_area_crosswalk(
 
     # Compute original areas for past precincts
     past_gdf = past_gdf.copy()
-    past_gdf["_orig_area"] = past_gdf.geometry.area
+    past_gdf["_orig_area"] = shapely.area(past_gdf.geometry.to_numpy())
 
     # Use spatial index for efficient overlay
     logger.debug("Building spatial index...")
@@ -120,7 +121,7 @@ def _build_area_crosswalk(
         return pd.DataFrame(columns=[past_id, base_id, "frac"])
 
     # Compute intersection areas
-    overlay["_intersect_area"] = overlay.geometry.area
+    overlay["_intersect_area"] = shapely.area(overlay.geometry.to_numpy())
 
     # Filter out slivers
     overlay = overlay[overlay["_intersect_area"] > sliver_tolerance]
@@ -193,12 +194,14 @@ def _build_population_crosswalk(
         past_gdf[[past_id, "geometry"]],
         how="intersection",
     )
-    blocks_past = blocks_past[blocks_past.geometry.area > sliver_tolerance]
+    blocks_past["_intersect_area"] = shapely.area(blocks_past.geometry.to_numpy())
+    blocks_past = blocks_past[blocks_past["_intersect_area"] > sliver_tolerance]
 
     # Allocate block population to past precincts based on area fraction
-    block_areas = blocks_gdf.set_index("_block_id").geometry.area
+    block_areas = pd.Series(
+        shapely.area(blocks_gdf.geometry.to_numpy()), index=blocks_gdf["_block_id"]
+    )
     blocks_past["_block_orig_area"] = blocks_past["_block_id"].map(block_areas)
-    blocks_past["_intersect_area"] = blocks_past.geometry.area
     blocks_past["_area_frac"] = (
         blocks_past["_intersect_area"] / blocks_past["_block_orig_area"]
     )
@@ -211,11 +214,11 @@ def _build_population_crosswalk(
         base_gdf[[base_id, "geometry"]],
         how="intersection",
     )
-    blocks_base = blocks_base[blocks_base.geometry.area > sliver_tolerance]
+    blocks_base["_intersect_area"] = shapely.area(blocks_base.geometry.to_numpy())
+    blocks_base = blocks_base[blocks_base["_intersect_area"] > sliver_tolerance]
 
     # Allocate block population to base precincts
     blocks_base["_block_orig_area"] = blocks_base["_block_id"].map(block_areas)
-    blocks_base["_intersect_area"] = blocks_base.geometry.area
     blocks_base["_area_frac"] = blocks_base["_intersect_area"] / blocks_base["_block_orig_area"]
     blocks_base["_allocated_pop"] = blocks_base["_pop"] * blocks_base["_area_frac"]
 
@@ -0,0 +1,131 @@
+"""Tests for the shared precinct/Census overlay used by the aggregation scripts."""
+
+import os
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+from shapely.geometry import box
+
+# The overlay module lives with the scripts, which are not a package
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import precinct_overlay  # noqa: E402
+from precinct_overlay import build_precinct_overlay, compute_precinct_overlay  # noqa: E402
+
+CRS = "EPSG:3735"
+
+
+@pytest.fixture
+def precincts():
+    """Two side-by-side 2x2 precincts."""
+    return gpd.GeoDataFrame(
+        {"PRECINCT": ["A", "B"]},
+        geometry=[box(0, 0, 2, 2), box(2, 0, 4, 2)],
+        crs=CRS,
+    )
+
+
+@pytest.fixture
+def census():
+    """One block group straddling both precincts, one touching B's edge, one inside A."""
+    return gpd.GeoDataFrame(
+        {"GEOID": ["G1", "G2", "G3"]},
+        geometry=[box(1, 0, 3, 2), box(4, 0, 5, 2), box(0, 0, 0.5, 0.5)],
+        crs=CRS,
+    )
+
+
+def _pairs(overlay, left, right):
+    """Overlay rows as {(left id, right id): intersection area}."""
+    return {
+        (a, b): area
+        for a, b, area in zip(
+            overlay[left], overlay[right], overlay["intersection_area"], strict=True
+        )
+    }
+
+
+def test_area_fraction_and_boundary_pairs(precincts, census):
+    """Area fractions are per Census polygon; edge-only contacts are dropped."""
+    overlay = compute_precinct_overlay(precincts, census, "PRECINCT")
+
+    fractions = {
+        (p, g): frac
+        for p, g, frac in zip(
+            overlay["PRECINCT"], overlay["GEOID"], overlay["area_fraction"], strict=True
+        )
+    }
+    assert fractions == {
+        ("A", "G1"): pytest.approx(0.5),
+        ("B", "G1"): pytest.approx(0.5),
+        ("A", "G3"): pytest.approx(1.0),
+    }
+    # G2 only shares B's boundary
+    assert "G2" not in set(overlay["GEOID"])
+
+
+def test_smaller_layer_choice_gives_same_pairs(precincts, census):
+    """Swapping which layer is smaller (the STRtree query side) gives the same pairs."""
+    forward = compute_precinct_overlay(precincts, census, "PRECINCT")
+
+    # Census polygons as the "precinct" layer and vice versa
+    swapped = compute_precinct_overlay(
+        census.rename(columns={"GEOID": "ID"}),
+        precincts.rename(columns={"PRECINCT": "GEOID"}),
+        "ID",
+    )
+
+    forward_pairs = _pairs(forward, "PRECINCT", "GEOID")
+    swapped_pairs = {(p, g): area for (g, p), area in _pairs(swapped, "ID", "GEOID").items()}
+    assert forward_pairs.keys() == swapped_pairs.keys()
+    for pair, area in forward_pairs.items():
+        assert swapped_pairs[pair] == pytest.approx(area)
+
+
+def test_chunked_intersection_matches_single_call(monkeypatch):
+    """The threaded, chunked path returns the same areas in the same order."""
+    monkeypatch.setattr(precinct_overlay.os, "cpu_count", lambda: 4)
+
+    n_pairs = 3 * precinct_overlay.MIN_PAIRS_PER_THREAD + 7
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 100, (2, n_pairs))
+    left = shapely.box(x, y, x + 2, y + 2)
+    right = shapely.box(x + 1, y + 0.5, x + 4, y + 3)
+
+    chunked = precinct_overlay._intersection_areas(left, right)
+    expected = shapely.area(shapely.intersection(left, right))
+
+    np.testing.assert_allclose(chunked, expected)
+
+
+def test_stale_cache_is_rebuilt(tmp_path, precincts, census):
+    """A cache older than its sources is recomputed; a newer one is reused."""
+    source = tmp_path / "precincts.shp"
+    source.write_text("placeholder")
+    cache_path = tmp_path / "overlay.parquet"
+
+    # A bogus cache that predates the source must be ignored and overwritten
+    pd.DataFrame({"PRECINCT": ["stale"], "GEOID": ["X"]}).to_parquet(cache_path)
+    source_mtime = source.stat().st_mtime
+    os.utime(cache_path, (source_mtime - 60, source_mtime - 60))
+
+    overlay = build_precinct_overlay(
+        precincts, census, "PRECINCT", cache_path=cache_path, sources=(source,)
+    )
+    assert set(overlay["GEOID"]) == {"G1", "G3"}
+    assert set(pd.read_parquet(cache_path)["GEOID"]) == {"G1", "G3"}
+
+    # Once the cache is newer than the source it is returned as-is
+    bogus = pd.DataFrame({"PRECINCT": ["cached"], "GEOID": ["Y"]})
+    bogus.to_parquet(cache_path)
+    os.utime(cache_path, (source_mtime + 60, source_mtime + 60))
+
+    reused = build_precinct_overlay(
+        precincts, census, "PRECINCT", cache_path=cache_path, sources=(source,)
+    )
+    pd.testing.assert_frame_equal(reused, bogus)